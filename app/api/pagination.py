@@ -0,0 +1,147 @@
+"""
+Keyset (cursor) pagination for job listing endpoints.
+
+Pages are ordered by (date_found, id) descending and the next page starts
+strictly after the last row returned, so page N costs the same as page 1.
+Cursors are opaque URL-safe tokens.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import Select
+from app.db.models import (
+    JOB_SUMMARY_FIELDS, JOB_SUMMARY_OPTIONAL_FIELDS,
+    JobDescription, JobListing, JobListingPage, JobListingSummary, decompress_text
+)
+
+
+def encode_cursor(date_found: datetime, job_id: int) -> str:
+    """
+    Encodes the position of a row as an opaque cursor.
+    
+    Args:
+        date_found: The row's date_found.
+        job_id: The row's id.
+    
+    Returns:
+        A URL-safe cursor token.
+    """
+    payload = json.dumps({"d": date_found.isoformat(), "i": job_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decodes a cursor produced by `encode_cursor`.
+    
+    Args:
+        cursor: The cursor token.
+    
+    Returns:
+        Tuple of (date_found, id).
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["d"]), int(payload["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def select_job_summaries(fields: Optional[str] = None) -> Select:
+    """
+    Builds a SELECT of only the list-view columns of JobListing.
+    
+    Args:
+        fields: Comma-separated extra fields to include
+            (any of JOB_SUMMARY_OPTIONAL_FIELDS), or None.
+    
+    Returns:
+        A select of the summary columns plus the requested extras.
+    
+    Raises:
+        HTTPException: 400 if an unknown field is requested.
+    """
+    extras = [name.strip() for name in (fields or "").split(",") if name.strip()]
+    unknown = [name for name in extras if name not in JOB_SUMMARY_OPTIONAL_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. "
+                   f"Allowed: {', '.join(JOB_SUMMARY_OPTIONAL_FIELDS)}"
+        )
+    names = list(JOB_SUMMARY_FIELDS) + list(dict.fromkeys(extras))
+    columns = [
+        getattr(JobListing, name) for name in names if name != "description_text"
+    ]
+    if "description_text" not in names:
+        return select(*columns)
+    # Descriptions live compressed in their side table; decompressed in paginate_jobs
+    return select(*columns, JobDescription.content.label("description_text")).outerjoin(
+        JobDescription, JobDescription.job_id == JobListing.id
+    )
+
+
+def keyset_page_query(query: Select, limit: int, cursor: Optional[str] = None) -> Select:
+    """
+    Restricts a job summary query to one keyset page.
+    
+    Args:
+        query: A `select_job_summaries` query with filters applied but no ordering.
+        limit: Page size; one extra row is selected to detect a next page.
+        cursor: Cursor from a previous page, or None for the first page.
+    
+    Returns:
+        The query ordered by (date_found, id) descending, after the cursor.
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed.
+    """
+    if cursor:
+        date_found, job_id = decode_cursor(cursor)
+        query = query.where(tuple_(JobListing.date_found, JobListing.id) < (date_found, job_id))
+    return query.order_by(JobListing.date_found.desc(), JobListing.id.desc()).limit(limit + 1)
+
+
+async def paginate_jobs(
+    session: AsyncSession,
+    query: Select,
+    limit: int,
+    cursor: Optional[str] = None
+) -> JobListingPage:
+    """
+    Runs a job summary query one keyset page at a time.
+    
+    Args:
+        session: Database session.
+        query: A `select_job_summaries` query with filters applied but no ordering.
+        limit: Page size.
+        cursor: Cursor from a previous page, or None for the first page.
+    
+    Returns:
+        The page items and the cursor for the next page (None on the last page).
+    """
+    # One extra row is fetched to learn whether another page exists
+    rows = (await session.exec(keyset_page_query(query, limit, cursor))).all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(last.date_found, last.id)
+    # Only the selected columns are set, so unrequested extras stay out of the response
+    items = []
+    for row in rows[:limit]:
+        values = dict(row._mapping)
+        if "description_text" in values:
+            values["description_text"] = decompress_text(values["description_text"])
+        items.append(JobListingSummary(**values))
+    return JobListingPage(items=items, next_cursor=next_cursor)
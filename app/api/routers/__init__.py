@@ -8,6 +8,7 @@ from fastapi import APIRouter
 from app.api.routers.companies import router as companies_router
 from app.api.routers.profile import router as profile_router
 from app.api.routers.jobs import router as jobs_router
+from app.api.routers.metrics import router as metrics_router
 
 router = APIRouter()
 
@@ -15,3 +16,4 @@ router = APIRouter()
 router.include_router(companies_router)
 router.include_router(profile_router)
 router.include_router(jobs_router)
+router.include_router(metrics_router)
@@ -3,17 +3,18 @@ Company API endpoints for managing monitored companies.
 """
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.db.database import get_session
-from app.db.models import Company
+from app.db.models import Company, CompanyCreate
 
 router = APIRouter(prefix="/companies", tags=["companies"])
 
 
 @router.post("/", response_model=Company)
-def create_company(
-    company: Company, 
-    session: Session = Depends(get_session)
+async def create_company(
+    company: CompanyCreate, 
+    session: AsyncSession = Depends(get_session)
 ) -> Company:
     """
     Create a new company to monitor for job listings.
@@ -25,14 +26,15 @@ def create_company(
     Returns:
         The created company with its assigned ID.
     """
-    session.add(company)
-    session.commit()
-    session.refresh(company)
-    return company
+    db_company = Company.model_validate(company)
+    session.add(db_company)
+    await session.commit()
+    await session.refresh(db_company)
+    return db_company
 
 
 @router.get("/", response_model=list[Company])
-def read_companies(session: Session = Depends(get_session)) -> list[Company]:
+async def read_companies(session: AsyncSession = Depends(get_session)) -> list[Company]:
     """
     Retrieve all monitored companies.
     
@@ -42,5 +44,5 @@ def read_companies(session: Session = Depends(get_session)) -> list[Company]:
     Returns:
         List of all companies in the database.
     """
-    companies = session.exec(select(Company)).all()
+    companies = (await session.exec(select(Company))).all()
     return companies
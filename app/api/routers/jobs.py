@@ -2,39 +2,45 @@
 Job listing API endpoints for viewing scraped job data.
 """
 
-from typing import Optional, List
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select
+from sqlalchemy import and_, func
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.api.pagination import paginate_jobs, select_job_summaries
 from app.db.database import get_session
-from app.db.models import JobListing, Company
+from app.db.models import JobListing, JobListingPage, JobListingRead, Company
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
 
-@router.get("/", response_model=List[JobListing])
-def list_jobs(
+@router.get("/", response_model=JobListingPage, response_model_exclude_unset=True)
+async def list_jobs(
     company_id: Optional[int] = Query(None, description="Filter by company ID"),
     min_score: Optional[int] = Query(None, ge=0, le=100, description="Minimum match score"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of results"),
-    offset: int = Query(0, ge=0, description="Number of results to skip"),
-    session: Session = Depends(get_session)
-) -> List[JobListing]:
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
+    fields: Optional[str] = Query(None, description="Extra fields: match_reasoning,missing_skills,description_text"),
+    session: AsyncSession = Depends(get_session)
+) -> JobListingPage:
     """
-    Retrieve job listings with optional filters.
+    Retrieve job listing summaries with optional filters, most recent first.
     
     Args:
         company_id: Filter jobs by a specific company.
         min_score: Filter jobs with match score >= this value.
         is_active: Filter by whether the job is still active.
         limit: Maximum number of results to return.
-        offset: Number of results to skip (for pagination).
+        cursor: Opaque cursor returned as next_cursor by the previous page.
+        fields: Comma-separated extra fields to include in each item.
         session: Database session (injected).
     
     Returns:
-        List of job listings matching the criteria.
+        A page of job summaries matching the criteria and the next cursor.
     """
-    query = select(JobListing)
+    query = select_job_summaries(fields)
     
     if company_id is not None:
         query = query.where(JobListing.company_id == company_id)
@@ -45,43 +51,39 @@ def list_jobs(
     if is_active is not None:
         query = query.where(JobListing.is_active == is_active)
     
-    # Order by most recent first
-    query = query.order_by(JobListing.date_found.desc())
-    
-    # Apply pagination
-    query = query.offset(offset).limit(limit)
-    
-    jobs = session.exec(query).all()
-    return jobs
+    # Keyset pagination, most recent first
+    return await paginate_jobs(session, query, limit, cursor)
 
 
 @router.get("/stats")
-def get_job_stats(session: Session = Depends(get_session)) -> dict:
+async def get_job_stats(session: AsyncSession = Depends(get_session)) -> dict:
     """
     Get summary statistics of all scraped jobs.
     
     Returns:
         Statistics including total jobs, active jobs, and score distribution.
     """
-    all_jobs = session.exec(select(JobListing)).all()
-    
-    total = len(all_jobs)
-    active = sum(1 for j in all_jobs if j.is_active)
-    with_scores = [j for j in all_jobs if j.match_score is not None]
-    
-    avg_score = None
-    if with_scores:
-        avg_score = round(sum(j.match_score for j in with_scores) / len(with_scores), 1)
-    
-    # Score distribution
-    high_match = sum(1 for j in with_scores if j.match_score >= 70)
-    medium_match = sum(1 for j in with_scores if 40 <= j.match_score < 70)
-    low_match = sum(1 for j in with_scores if j.match_score < 40)
+    # One aggregate query; no rows (or descriptions) are loaded into Python
+    score = JobListing.match_score
+    total, active, analyzed, avg_score, high_match, medium_match, low_match = (await session.exec(
+        select(
+            func.count(JobListing.id),
+            func.count(JobListing.id).filter(JobListing.is_active == True),
+            func.count(score),
+            func.avg(score),
+            func.count(score).filter(score >= 70),
+            func.count(score).filter(and_(score >= 40, score < 70)),
+            func.count(score).filter(score < 40),
+        )
+    )).one()
+    
+    if avg_score is not None:
+        avg_score = round(float(avg_score), 1)
     
     return {
         "total_jobs": total,
         "active_jobs": active,
-        "analyzed_jobs": len(with_scores),
+        "analyzed_jobs": analyzed,
         "average_match_score": avg_score,
         "score_distribution": {
             "high_match_70_plus": high_match,
@@ -91,8 +93,8 @@ def get_job_stats(session: Session = Depends(get_session)) -> dict:
     }
 
 
-@router.get("/{job_id}", response_model=JobListing)
-def get_job(job_id: int, session: Session = Depends(get_session)) -> JobListing:
+@router.get("/{job_id}", response_model=JobListingRead)
+async def get_job(job_id: int, session: AsyncSession = Depends(get_session)) -> JobListingRead:
     """
     Retrieve a specific job listing by ID.
     
@@ -106,45 +108,47 @@ def get_job(job_id: int, session: Session = Depends(get_session)) -> JobListing:
     Raises:
         HTTPException: 404 if job not found.
     """
-    job = session.get(JobListing, job_id)
+    # The description must be loaded eagerly; async sessions cannot lazy-load
+    job = await session.get(JobListing, job_id, options=[selectinload(JobListing.description)])
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    return job
+    return JobListingRead.from_job(job)
 
 
-@router.get("/company/{company_id}", response_model=List[JobListing])
-def get_jobs_by_company(
+@router.get("/company/{company_id}", response_model=JobListingPage, response_model_exclude_unset=True)
+async def get_jobs_by_company(
     company_id: int,
-    session: Session = Depends(get_session)
-) -> List[JobListing]:
+    limit: int = Query(50, ge=1, le=100, description="Maximum number of results"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
+    fields: Optional[str] = Query(None, description="Extra fields: match_reasoning,missing_skills,description_text"),
+    session: AsyncSession = Depends(get_session)
+) -> JobListingPage:
     """
-    Retrieve all job listings for a specific company.
+    Retrieve job listing summaries for a specific company, most recent first.
     
     Args:
         company_id: The ID of the company.
+        limit: Maximum number of results to return.
+        cursor: Opaque cursor returned as next_cursor by the previous page.
+        fields: Comma-separated extra fields to include in each item.
         session: Database session (injected).
     
     Returns:
-        List of all jobs from the specified company.
+        A page of job summaries from the specified company and the next cursor.
     
     Raises:
         HTTPException: 404 if company not found.
     """
-    company = session.get(Company, company_id)
+    company = await session.get(Company, company_id)
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
     
-    jobs = session.exec(
-        select(JobListing)
-        .where(JobListing.company_id == company_id)
-        .order_by(JobListing.date_found.desc())
-    ).all()
-    
-    return jobs
+    query = select_job_summaries(fields).where(JobListing.company_id == company_id)
+    return await paginate_jobs(session, query, limit, cursor)
 
 
 @router.delete("/{job_id}")
-def delete_job(job_id: int, session: Session = Depends(get_session)) -> dict:
+async def delete_job(job_id: int, session: AsyncSession = Depends(get_session)) -> dict:
     """
     Delete a job listing by ID.
     
@@ -158,11 +162,11 @@ def delete_job(job_id: int, session: Session = Depends(get_session)) -> dict:
     Raises:
         HTTPException: 404 if job not found.
     """
-    job = session.get(JobListing, job_id)
+    job = await session.get(JobListing, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    session.delete(job)
-    session.commit()
+    await session.delete(job)
+    await session.commit()
     
     return {"message": f"Job {job_id} deleted successfully"}
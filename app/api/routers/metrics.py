@@ -0,0 +1,111 @@
+"""
+Metrics API endpoints for observing scraper resource usage.
+"""
+
+from fastapi import APIRouter
+from app.core import scheduler
+from app.core.browser_pool import browser_pool
+from app.core.extraction import extraction_stats
+from app.core.readiness import readiness_stats
+from app.core.resource_blocking import blocking_stats
+from app.db.instrumentation import pool_metrics, query_metrics
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/browser-pool")
+def get_browser_pool_stats() -> dict:
+    """
+    Get usage counters of the shared Chromium browser pool.
+    
+    Returns:
+        Pool size, live browsers, active contexts and launch/recycle/crash counts.
+    """
+    return browser_pool.stats()
+
+
+@router.get("/resource-blocking")
+def get_resource_blocking_stats() -> dict:
+    """
+    Get totals of browser requests aborted by resource blocking.
+    
+    Returns:
+        Blocked and allowed request counts, blocked counts per resource
+        type and the estimated bytes saved since startup.
+    """
+    return blocking_stats.stats()
+
+
+@router.get("/readiness")
+def get_readiness_stats() -> dict:
+    """
+    Get page readiness wait times of browser-rendered pages.
+    
+    Returns:
+        Per strategy (selector / dom-stable): pages, average and maximum
+        wait in seconds, and how many hit the READINESS_MAX_SECONDS cap.
+    """
+    return readiness_stats.stats()
+
+
+@router.get("/extraction")
+def get_extraction_stats() -> dict:
+    """
+    Get job description extraction statistics.
+    
+    Returns:
+        Pages per extraction method (json-ld / selector / density / page),
+        and the characters kept compared to the whole page text.
+    """
+    return extraction_stats.stats()
+
+
+@router.get("/scan")
+def get_last_scan_summary() -> dict:
+    """
+    Get the summary of the most recent daily scan.
+    
+    Returns:
+        Overall duration plus per-company status and duration, slowest first.
+    """
+    if scheduler.last_scan_summary is None:
+        return {"message": "No scan has run yet"}
+    return scheduler.last_scan_summary
+
+
+@router.get("/db")
+def get_db_query_stats(top: int = 50) -> dict:
+    """
+    Get SQL statement latency metrics (requires DB_QUERY_METRICS_ENABLED).
+    
+    Args:
+        top: Number of statements to return, by total time spent.
+    
+    Returns:
+        Per-statement latency histograms and the recent slow query log.
+    """
+    return query_metrics.snapshot(top=top)
+
+
+@router.delete("/db")
+def reset_db_query_stats() -> dict:
+    """
+    Clear the SQL statement latency metrics, e.g. before measuring a scan.
+    
+    Returns:
+        Confirmation message.
+    """
+    query_metrics.reset()
+    return {"message": "Query metrics reset"}
+
+
+@router.get("/db-pool")
+def get_db_pool_stats() -> dict:
+    """
+    Get connection pool usage and checkout wait times.
+    
+    Returns:
+        Per engine pool: size, overflow, connections checked out, checkout
+        wait histogram and timeouts.
+    """
+    return pool_metrics.snapshot()
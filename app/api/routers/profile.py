@@ -3,7 +3,8 @@ User profile API endpoints for managing the user's resume and preferences.
 """
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.db.database import get_session
 from app.db.models import UserProfile
 
@@ -11,9 +12,9 @@ router = APIRouter(prefix="/profile", tags=["profile"])
 
 
 @router.post("/", response_model=UserProfile)
-def update_profile(
+async def update_profile(
     profile: UserProfile, 
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ) -> UserProfile:
     """
     Create or update the user's profile.
@@ -28,24 +29,24 @@ def update_profile(
     Returns:
         The created or updated user profile.
     """
-    existing = session.exec(select(UserProfile)).first()
+    existing = (await session.exec(select(UserProfile))).first()
     if existing:
         existing.name = profile.name
         existing.resume_text = profile.resume_text
         existing.preferences = profile.preferences
         session.add(existing)
-        session.commit()
-        session.refresh(existing)
+        await session.commit()
+        await session.refresh(existing)
         return existing
     else:
         session.add(profile)
-        session.commit()
-        session.refresh(profile)
+        await session.commit()
+        await session.refresh(profile)
         return profile
 
 
 @router.get("/", response_model=UserProfile)
-def get_profile(session: Session = Depends(get_session)) -> UserProfile:
+async def get_profile(session: AsyncSession = Depends(get_session)) -> UserProfile:
     """
     Retrieve the current user's profile.
     
@@ -58,7 +59,7 @@ def get_profile(session: Session = Depends(get_session)) -> UserProfile:
     Raises:
         HTTPException: 404 if no profile has been set.
     """
-    profile = session.exec(select(UserProfile)).first()
+    profile = (await session.exec(select(UserProfile))).first()
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not set")
     return profile
@@ -1,18 +1,28 @@
 """
 AI-powered job analysis using OpenRouter API.
 
-Provides functions for analyzing job matches and navigation steps.
+Provides functions for analyzing job matches (singly or in batches) and
+navigation steps.
 Uses OpenAI-compatible API to access various LLM models through OpenRouter.
 """
 
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, APIConnectionError, APIStatusError, RateLimitError
+from typing import Optional
+import asyncio
+import hashlib
 import json
+import random
+import re
 from app.config import settings
 from app.db.models import UserProfile
+from app.core.rate_limit import openrouter_limiter
 
 # OpenRouter API Configuration
 OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 
+# Bump whenever the job match prompt changes, so cached results are not reused
+MATCH_PROMPT_VERSION = "1"
+
 # Configure OpenRouter Client
 _client = None
 
@@ -27,11 +37,127 @@ def get_client() -> AsyncOpenAI:
             default_headers={
                 "HTTP-Referer": "https://github.com/job-auto-applier",
                 "X-Title": "Job Auto-Applier"
-            }
+            },
+            max_retries=0  # Retries are handled by _create_completion
         )
     return _client
 
 
+def _is_retryable(error: Exception) -> bool:
+    """Whether an API error is worth retrying (rate limits and transient failures)."""
+    if isinstance(error, (RateLimitError, APIConnectionError)):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code in (408, 409) or error.status_code >= 500
+    return False
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """Backoff delay for a retry: Retry-After if given, else exponential with jitter."""
+    if isinstance(error, APIStatusError):
+        retry_after = error.response.headers.get("retry-after")
+        try:
+            if retry_after is not None:
+                return min(float(retry_after), 120.0)
+        except ValueError:
+            pass
+    delay = min(settings.LLM_RETRY_BASE_SECONDS * (2 ** attempt), 60.0)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+async def _create_completion(client: AsyncOpenAI, max_retries: Optional[int] = None, **kwargs):
+    """
+    Sends a chat completion through the shared rate limiter, retrying
+    rate-limited and transient failures with exponential backoff and jitter.
+    
+    Args:
+        client: The OpenRouter client.
+        max_retries: Overrides LLM_MAX_RETRIES.
+        **kwargs: Passed to `client.chat.completions.create`.
+    
+    Returns:
+        The completion response.
+    
+    Raises:
+        The last API error once retries are exhausted, or any non-retryable error.
+    """
+    retries = settings.LLM_MAX_RETRIES if max_retries is None else max_retries
+    # Rough estimate: ~4 characters per token for the prompt plus the completion budget
+    prompt_chars = sum(len(message.get("content") or "") for message in kwargs.get("messages", []))
+    estimated_tokens = prompt_chars // 4 + kwargs.get("max_tokens", 0)
+    
+    attempt = 0
+    while True:
+        await openrouter_limiter.acquire(estimated_tokens)
+        try:
+            return await client.chat.completions.create(**kwargs)
+        except Exception as e:
+            if attempt >= retries or not _is_retryable(e):
+                raise
+            delay = _retry_delay(e, attempt)
+            attempt += 1
+            print(f"AI call failed ({e.__class__.__name__}), retry {attempt}/{retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+def _failed_analysis(reason: str, retryable: bool = True) -> dict:
+    """
+    Result for an analysis that could not be completed.
+    
+    Retryable failures are re-scored later; the others (API errors such as
+    400 or 403 that no retry fixes) are recorded as failed.
+    """
+    return {"match_score": None, "reasoning": reason, "missing_skills": [], "error": True, "retryable": retryable}
+
+
+def normalize_job_text(job_text: str) -> str:
+    """
+    Normalizes job text so trivially different copies of a posting compare equal.
+    
+    Args:
+        job_text: Raw scraped job text.
+    
+    Returns:
+        Lowercased text with all whitespace runs collapsed to single spaces.
+    """
+    return re.sub(r"\s+", " ", job_text or "").strip().lower()
+
+
+def profile_fingerprint(user_profile: UserProfile) -> str:
+    """
+    Hashes the profile fields that are sent to the LLM.
+    
+    Args:
+        user_profile: The user's profile.
+    
+    Returns:
+        A hex digest that changes whenever the resume or preferences change.
+    """
+    payload = "\x1f".join([user_profile.name or "", user_profile.resume_text or "", user_profile.preferences or ""])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def analysis_cache_key(job_text: str, user_profile: UserProfile) -> str:
+    """
+    Builds the cache key for a job match analysis.
+    
+    Args:
+        job_text: The job description text.
+        user_profile: The user's profile.
+    
+    Returns:
+        A sha256 hex digest of the normalized job text, profile fingerprint,
+        model and prompt version.
+    """
+    payload = "\x1f".join([
+        normalize_job_text(job_text),
+        profile_fingerprint(user_profile),
+        settings.OPENROUTER_MODEL,
+        MATCH_PROMPT_VERSION,
+    ])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 async def analyze_job_match(job_text: str, user_profile: UserProfile) -> dict:
     """
     Analyzes the match between a job description and the user profile using OpenRouter.
@@ -42,10 +168,12 @@ async def analyze_job_match(job_text: str, user_profile: UserProfile) -> dict:
     
     Returns:
         A dict with 'match_score' (0-100), 'reasoning', and 'missing_skills'.
+        Failed analyses have 'match_score' None and 'error': True; they must
+        not be cached, and are retried later unless 'retryable' is False.
     """
     client = get_client()
     if not client:
-        return {"match_score": 0, "reasoning": "API Key missing", "missing_skills": []}
+        return _failed_analysis("API Key missing")
 
     prompt = f"""You are an expert technical recruiter. Analyze the following candidate profile and job description.
 
@@ -70,7 +198,8 @@ Respond ONLY with valid JSON in this exact format:
 }}"""
 
     try:
-        response = await client.chat.completions.create(
+        response = await _create_completion(
+            client,
             model=settings.OPENROUTER_MODEL,
             messages=[
                 {"role": "system", "content": "You are a JSON-only response bot. Always respond with valid JSON."},
@@ -79,11 +208,136 @@ Respond ONLY with valid JSON in this exact format:
             response_format={"type": "json_object"},
             max_tokens=500
         )
-        result = json.loads(response.choices[0].message.content)
-        return result
+        result = _parse_match_result(json.loads(response.choices[0].message.content))
     except Exception as e:
         print(f"AI Error: {e}")
-        return {"match_score": 0, "reasoning": f"Error: {str(e)}", "missing_skills": []}
+        permanent = isinstance(e, APIStatusError) and not _is_retryable(e)
+        return _failed_analysis(f"Error: {str(e)}", retryable=not permanent)
+    if result is None:
+        print("AI Error: response is not a valid match result")
+        return _failed_analysis("Error: malformed AI response")
+    return result
+
+
+def _parse_match_result(item) -> Optional[dict]:
+    """
+    Validates a match result: a single-job response or one batch entry.
+    
+    Returns:
+        The result in `analyze_job_match` format with an int score clamped
+        to 0-100, or None if malformed.
+    """
+    if not isinstance(item, dict):
+        return None
+    score = item.get("match_score")
+    if isinstance(score, str):
+        try:
+            score = float(score)
+        except ValueError:
+            return None
+    if isinstance(score, bool) or not isinstance(score, (int, float)) or score != score:
+        return None
+    missing_skills = item.get("missing_skills") or []
+    if not isinstance(missing_skills, list):
+        return None
+    return {
+        "match_score": max(0, min(100, int(score))),
+        "reasoning": str(item.get("reasoning", "")),
+        "missing_skills": [str(skill) for skill in missing_skills],
+    }
+
+
+async def analyze_job_matches_batch(job_texts: list[str], user_profile: UserProfile) -> list[dict]:
+    """
+    Scores several jobs in one request that carries a single copy of the profile.
+    
+    Each description is truncated to ANALYSIS_BATCH_JOB_CHARS. Jobs whose
+    entry in the response is missing or malformed (or all of them, if the
+    JSON does not parse) fall back to `analyze_job_match`. If the request is
+    still rate limited after retries, every job is returned as failed.
+    
+    Args:
+        job_texts: The job description texts.
+        user_profile: The user's profile containing resume and preferences.
+    
+    Returns:
+        One result dict per job, in input order, in `analyze_job_match` format.
+    """
+    if len(job_texts) <= 1:
+        return [await analyze_job_match(text, user_profile) for text in job_texts]
+    
+    client = get_client()
+    if not client:
+        return [
+            _failed_analysis("API Key missing")
+            for _ in job_texts
+        ]
+    
+    jobs_block = "\n\n".join(
+        f"JOB {index}:\n{text[:settings.ANALYSIS_BATCH_JOB_CHARS]}"
+        for index, text in enumerate(job_texts)
+    )
+    prompt = f"""You are an expert technical recruiter. Analyze the following candidate profile
+against each of the {len(job_texts)} job descriptions below.
+
+CANDIDATE PROFILE:
+Name: {user_profile.name}
+Resume/Skills: {user_profile.resume_text}
+Preferences: {user_profile.preferences}
+
+JOB DESCRIPTIONS:
+{jobs_block}
+
+For EACH job, evaluate the match score (0-100) based on:
+1. Technical skills alignment.
+2. Years of experience alignment.
+3. Location/Remote preferences (if specified in job).
+
+Respond ONLY with valid JSON in this exact format, with one entry per job:
+{{
+    "results": [
+        {{
+            "index": <job number>,
+            "match_score": <int>,
+            "reasoning": "<short explanation>",
+            "missing_skills": ["<skill1>", "<skill2>"]
+        }}
+    ]
+}}"""
+
+    results: list[Optional[dict]] = [None] * len(job_texts)
+    try:
+        response = await _create_completion(
+            client,
+            model=settings.OPENROUTER_MODEL,
+            messages=[
+                {"role": "system", "content": "You are a JSON-only response bot. Always respond with valid JSON."},
+                {"role": "user", "content": prompt}
+            ],
+            response_format={"type": "json_object"},
+            max_tokens=300 * len(job_texts)
+        )
+        data = json.loads(response.choices[0].message.content)
+        for item in data.get("results", []):
+            index = item.get("index") if isinstance(item, dict) else None
+            if isinstance(index, int) and 0 <= index < len(job_texts) and results[index] is None:
+                results[index] = _parse_match_result(item)
+    except Exception as e:
+        print(f"AI Batch Error: {e}")
+        if _is_retryable(e):
+            # Still rate limited after retries: don't multiply the load with single calls
+            return [_failed_analysis(f"Error: {str(e)}") for _ in job_texts]
+    
+    # Fall back to one request per job for anything the batch did not cover
+    missing = [index for index, result in enumerate(results) if result is None]
+    if missing:
+        print(f"AI Batch: falling back to single analysis for {len(missing)} of {len(job_texts)} jobs")
+        fallback = await asyncio.gather(
+            *(analyze_job_match(job_texts[index], user_profile) for index in missing)
+        )
+        for index, result in zip(missing, fallback):
+            results[index] = result
+    return results
 
 
 async def analyze_navigation_step(page_state: str, user_preferences: str) -> dict:
@@ -116,7 +370,8 @@ Respond ONLY with valid JSON:
 If you see a list of jobs already filtered, return action "stop"."""
 
     try:
-        response = await client.chat.completions.create(
+        response = await _create_completion(
+            client,
             model=settings.OPENROUTER_MODEL,
             messages=[
                 {"role": "system", "content": "You are a JSON-only response bot. Always respond with valid JSON."},
@@ -143,7 +398,9 @@ async def test_api_connection() -> tuple[bool, str]:
         return False, "OPENROUTER_API_KEY not configured"
     
     try:
-        response = await client.chat.completions.create(
+        response = await _create_completion(
+            client,
+            max_retries=0,
             model=settings.OPENROUTER_MODEL,
             messages=[{"role": "user", "content": "Say OK"}],
             max_tokens=5
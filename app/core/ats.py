@@ -0,0 +1,255 @@
+"""
+Structured job data from applicant tracking systems.
+
+Career pages hosted on Greenhouse, Lever or Workday are backed by public
+JSON APIs listing every open posting. Reading those replaces the career
+page render and most detail page loads: titles, locations and (for
+Greenhouse and Lever) descriptions arrive in one bulk request. Workday
+lists postings in pages of 20 and serves each description as a small
+JSON document, fetched by the detail stage instead of a browser page.
+
+Listing pages embedding schema.org JobPosting JSON-LD get the same
+treatment without an API. Postings are returned as candidate link dicts
+('text', 'href', plus 'location' and 'description_text' or 'detail_url'),
+so they flow through the same dedup, fingerprint and analysis steps as
+scraped links.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import parse_qs, urljoin, urlsplit
+import httpx
+from app.config import settings
+from app.core.extraction import html_to_text, job_postings_from_json_ld
+from app.core.http_fetch import http_fetcher, parse_html
+from app.core.links import canonicalize_url
+
+_GREENHOUSE_HOSTS = ("boards.greenhouse.io", "job-boards.greenhouse.io")
+_LEVER_API_HOSTS = {"jobs.lever.co": "api.lever.co", "jobs.eu.lever.co": "api.eu.lever.co"}
+_WORKDAY_HOST_RE = re.compile(r"^(?P<tenant>[\w-]+)\.wd\d+\.myworkdayjobs\.com$", re.IGNORECASE)
+_LOCALE_RE = re.compile(r"^[a-z]{2}-[A-Z]{2}$")
+
+# Largest page the Workday jobs endpoint accepts
+_WORKDAY_PAGE_SIZE = 20
+
+
+@dataclass
+class AtsBoard:
+    """A job board on a known ATS, and where its API lives."""
+
+    provider: str  # "greenhouse", "lever" or "workday"
+    api_url: str
+    board_url: str  # Human-facing board; Workday posting paths are relative to it
+
+
+def detect_ats(url: str) -> Optional[AtsBoard]:
+    """
+    Recognizes career page URLs of supported applicant tracking systems.
+
+    Args:
+        url: The company's career page URL.
+
+    Returns:
+        The board, or None if the URL is not a recognized ATS board.
+    """
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    segments = [segment for segment in parts.path.split("/") if segment]
+
+    if host in _GREENHOUSE_HOSTS:
+        # boards.greenhouse.io/<token>[/jobs/<id>] or the embed/job_board?for=<token> iframe
+        token = parse_qs(parts.query).get("for", [None])[0] if segments[:1] == ["embed"] else None
+        token = token or (segments[0] if segments and segments[0] != "embed" else None)
+        if token:
+            return AtsBoard(
+                "greenhouse", f"https://boards-api.greenhouse.io/v1/boards/{token}/jobs?content=true", url
+            )
+
+    if host in _LEVER_API_HOSTS and segments:
+        return AtsBoard("lever", f"https://{_LEVER_API_HOSTS[host]}/v0/postings/{segments[0]}?mode=json", url)
+
+    match = _WORKDAY_HOST_RE.match(host)
+    if match:
+        # <tenant>.wd<N>.myworkdayjobs.com/[<locale>/]<site>
+        locale = segments[0] if segments and _LOCALE_RE.match(segments[0]) else None
+        site_segments = segments[1:] if locale else segments
+        if site_segments:
+            site = site_segments[0]
+            board_url = f"https://{host}/{locale + '/' if locale else ''}{site}"
+            return AtsBoard("workday", f"https://{host}/wday/cxs/{match['tenant']}/{site}", board_url)
+    return None
+
+
+def _posting_link(title: str, url: str, location: Optional[str], **extra) -> Optional[dict]:
+    href = canonicalize_url(url) if url else None
+    if href is None:
+        return None
+    return {"text": title.strip()[:200], "href": href, "location": location or None, **extra}
+
+
+async def _greenhouse_postings(board: AtsBoard) -> list[dict]:
+    response = await http_fetcher.get(board.api_url)
+    response.raise_for_status()
+    links = []
+    for job in response.json().get("jobs", []):
+        link = _posting_link(
+            job.get("title") or "",
+            job.get("absolute_url"),
+            (job.get("location") or {}).get("name"),
+            description_text=html_to_text(job.get("content") or ""),
+        )
+        if link:
+            links.append(link)
+    return links
+
+
+async def _lever_postings(board: AtsBoard) -> list[dict]:
+    response = await http_fetcher.get(board.api_url)
+    response.raise_for_status()
+    links = []
+    for posting in response.json():
+        # The description is split into an intro, titled lists and a closing part
+        sections = [posting.get("descriptionPlain") or ""]
+        for section in posting.get("lists") or []:
+            sections.append(f"{section.get('text', '')}\n{html_to_text(section.get('content') or '')}")
+        sections.append(posting.get("additionalPlain") or "")
+        categories = posting.get("categories") or {}
+        location = categories.get("location")
+        if posting.get("workplaceType") == "remote":
+            location = f"{location} (remote)" if location else "Remote"
+        link = _posting_link(
+            posting.get("text") or "",
+            posting.get("hostedUrl"),
+            location,
+            description_text="\n\n".join(section.strip() for section in sections if section.strip()),
+        )
+        if link:
+            links.append(link)
+    return links
+
+
+async def _workday_postings(board: AtsBoard) -> list[dict]:
+    links = []
+    offset = 0
+    total = None
+    while offset < settings.ATS_MAX_POSTINGS:
+        response = await http_fetcher.post(
+            f"{board.api_url}/jobs",
+            json={"appliedFacets": {}, "limit": _WORKDAY_PAGE_SIZE, "offset": offset, "searchText": ""},
+        )
+        response.raise_for_status()
+        data = response.json()
+        postings = data.get("jobPostings") or []
+        if total is None:
+            total = data.get("total") or 0  # Only reliable on the first page
+        for posting in postings:
+            path = posting.get("externalPath")
+            if not path:
+                continue
+            link = _posting_link(
+                posting.get("title") or "",
+                f"{board.board_url}{path}",
+                posting.get("locationsText"),
+                detail_url=f"{board.api_url}{path}",
+            )
+            if link:
+                links.append(link)
+        offset += _WORKDAY_PAGE_SIZE
+        if not postings or offset >= total:
+            break
+    return links
+
+
+_PROVIDERS = {
+    "greenhouse": _greenhouse_postings,
+    "lever": _lever_postings,
+    "workday": _workday_postings,
+}
+
+
+async def fetch_ats_postings(board: AtsBoard) -> Optional[list[dict]]:
+    """
+    Lists every open posting of an ATS board.
+
+    Args:
+        board: The board, from `detect_ats`.
+
+    Returns:
+        Candidate link dicts with 'text', canonical 'href', 'location' and
+        either 'description_text' or a 'detail_url' for
+        `fetch_posting_detail`. None if the API could not be read, in which
+        case the career page is scraped as usual.
+    """
+    try:
+        links = await _PROVIDERS[board.provider](board)
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"Reading the {board.provider} API at {board.api_url} failed ({e}); scraping the page instead.")
+        return None
+    return links[:settings.ATS_MAX_POSTINGS]
+
+
+async def fetch_posting_detail(link: dict) -> Optional[dict]:
+    """
+    Fetches the description of a posting listed without one (Workday).
+
+    Args:
+        link: A candidate link carrying a 'detail_url'.
+
+    Returns:
+        Dict with 'description_text' and, if the posting has one, 'location'.
+        None if the API could not be read, in which case the posting's page
+        is loaded instead.
+    """
+    try:
+        response = await http_fetcher.get(link["detail_url"])
+        response.raise_for_status()
+        info = response.json().get("jobPostingInfo") or {}
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"  Reading {link['detail_url']} failed ({e}); loading the posting page instead.")
+        return None
+    detail = {"description_text": html_to_text(info.get("jobDescription") or "")}
+    if info.get("location"):
+        detail["location"] = info["location"]
+    return detail
+
+
+def merge_json_ld_postings(html_text: str, base_url: str, links: list[dict]) -> list[dict]:
+    """
+    Fills candidate links from the JobPostings a listing page embeds.
+
+    Candidates whose URL matches a posting get its title and location, and
+    its description if that holds at least DESCRIPTION_MIN_CHARS, so their
+    detail page is never loaded. Shorter descriptions are listing teasers;
+    those postings keep their detail page fetch. Postings missing from the
+    candidates are added. Pages marking up only some jobs lose nothing.
+    CPU-bound; the scraper runs it in a worker thread.
+
+    Args:
+        html_text: The listing page's HTML.
+        base_url: URL the page was served from.
+        links: Candidate links from `links.select_candidate_links`.
+
+    Returns:
+        The merged candidate links.
+    """
+    if "application/ld+json" not in html_text:
+        return links
+    own_url = canonicalize_url(base_url)
+    merged = {link["href"]: link for link in links}
+    for posting in job_postings_from_json_ld(parse_html(html_text)):
+        extra = {}
+        if len(posting["description"]) >= settings.DESCRIPTION_MIN_CHARS:
+            extra["description_text"] = posting["description"]
+        link = _posting_link(
+            posting["title"], urljoin(base_url, posting["url"]) if posting["url"] else None,
+            posting["location"], **extra,
+        )
+        if link is None or link["href"] == own_url:
+            continue
+        existing = merged.get(link["href"])
+        if existing is not None:
+            existing.update({key: value for key, value in link.items() if value})
+        elif link["text"]:
+            merged[link["href"]] = link
+    return list(merged.values())
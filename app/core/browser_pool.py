@@ -0,0 +1,173 @@
+"""
+Shared Chromium browser pool for the scraper.
+
+Keeps a small number of long-lived Playwright browsers alive for the whole
+process and hands out isolated BrowserContexts, so scraping a company no longer
+pays for a cold browser launch. Browsers are recycled after serving a
+configurable number of contexts, or relaunched when they crash.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+from playwright.async_api import async_playwright, Browser, BrowserContext, Playwright
+from app.config import settings
+
+
+@dataclass
+class _PooledBrowser:
+    """A browser owned by the pool plus its usage counters."""
+
+    browser: Browser
+    contexts_served: int = 0
+    active_contexts: int = 0
+    retired: bool = False
+
+
+class BrowserPool:
+    """
+    Process-wide pool of Chromium browsers handing out per-company contexts.
+
+    The pool starts lazily on first use, so it also works outside the FastAPI
+    lifespan (e.g. from `app.utils.verify`).
+    """
+
+    def __init__(self, size: int, max_contexts_per_browser: int, headless: bool = True):
+        self.size = max(1, size)
+        self.max_contexts_per_browser = max(1, max_contexts_per_browser)
+        self.headless = headless
+
+        self._playwright: Optional[Playwright] = None
+        self._slots: list[Optional[_PooledBrowser]] = [None] * self.size
+        self._retiring: list[_PooledBrowser] = []
+        self._lock = asyncio.Lock()
+        self._next_slot = 0
+
+        # Counters exposed through stats()
+        self.launches = 0
+        self.recycles = 0
+        self.crashes = 0
+        self.contexts_served = 0
+
+    async def start(self) -> None:
+        """Start the Playwright driver. Browsers are launched on demand."""
+        async with self._lock:
+            await self._ensure_started()
+
+    async def stop(self) -> None:
+        """Close every browser and stop the Playwright driver."""
+        async with self._lock:
+            for pooled in [*self._slots, *self._retiring]:
+                if pooled is not None:
+                    await self._close_browser(pooled)
+            self._slots = [None] * self.size
+            self._retiring = []
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    @asynccontextmanager
+    async def context(self, **context_options) -> AsyncIterator[BrowserContext]:
+        """
+        Borrow an isolated browser context for the duration of the block.
+
+        Args:
+            **context_options: Passed through to `Browser.new_context`.
+
+        Yields:
+            BrowserContext: A fresh context, closed when the block exits.
+        """
+        pooled = await self._acquire()
+        try:
+            context = await pooled.browser.new_context(**context_options)
+        except Exception:
+            await self._release(pooled)
+            raise
+
+        try:
+            yield context
+        finally:
+            try:
+                await context.close()
+            except Exception:
+                pass  # Browser may have crashed; it is replaced on next acquire
+            await self._release(pooled)
+
+    def stats(self) -> dict:
+        """
+        Report pool usage counters.
+
+        Returns:
+            A dict with pool size, live browsers, active contexts and
+            launch/recycle/crash counts.
+        """
+        live = [p for p in self._slots if p is not None]
+        return {
+            "pool_size": self.size,
+            "max_contexts_per_browser": self.max_contexts_per_browser,
+            "browsers_alive": len(live) + len(self._retiring),
+            "active_contexts": sum(p.active_contexts for p in [*live, *self._retiring]),
+            "browser_launches": self.launches,
+            "browser_recycles": self.recycles,
+            "browser_crashes": self.crashes,
+            "contexts_served": self.contexts_served,
+        }
+
+    async def _ensure_started(self) -> None:
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+
+    async def _acquire(self) -> _PooledBrowser:
+        async with self._lock:
+            await self._ensure_started()
+
+            index = self._next_slot
+            self._next_slot = (self._next_slot + 1) % self.size
+            pooled = self._slots[index]
+
+            if pooled is not None and not pooled.browser.is_connected():
+                # Crashed browser: drop it without waiting for its contexts
+                self.crashes += 1
+                pooled = None
+            elif pooled is not None and pooled.contexts_served >= self.max_contexts_per_browser:
+                # Recycle: close now if idle, otherwise once its last context is released
+                self.recycles += 1
+                pooled.retired = True
+                if pooled.active_contexts == 0:
+                    await self._close_browser(pooled)
+                else:
+                    self._retiring.append(pooled)
+                pooled = None
+
+            if pooled is None:
+                browser = await self._playwright.chromium.launch(headless=self.headless)
+                self.launches += 1
+                pooled = _PooledBrowser(browser=browser)
+                self._slots[index] = pooled
+
+            pooled.contexts_served += 1
+            pooled.active_contexts += 1
+            self.contexts_served += 1
+            return pooled
+
+    async def _release(self, pooled: _PooledBrowser) -> None:
+        async with self._lock:
+            pooled.active_contexts -= 1
+            if pooled.retired and pooled.active_contexts == 0:
+                if pooled in self._retiring:
+                    self._retiring.remove(pooled)
+                await self._close_browser(pooled)
+
+    async def _close_browser(self, pooled: _PooledBrowser) -> None:
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            print(f"Browser pool: failed to close browser: {e}")
+
+
+browser_pool = BrowserPool(
+    size=settings.BROWSER_POOL_SIZE,
+    max_contexts_per_browser=settings.BROWSER_MAX_CONTEXTS_PER_BROWSER,
+    headless=settings.BROWSER_HEADLESS,
+)
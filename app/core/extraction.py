@@ -0,0 +1,303 @@
+"""
+Main-content extraction for job detail pages.
+
+`document.body.innerText` carries headers, footers, cookie banners and
+"similar jobs" widgets along with the posting, and all of it was stored
+and sent to the LLM. The description is instead taken from, in order:
+
+1. a schema.org `JobPosting` JSON-LD block, which most ATS pages embed;
+2. the company's `description_selector`, if set;
+3. the densest text block of the page once boilerplate is removed
+   (a readability-style heuristic);
+4. the whole page text, if none of the above yields enough text.
+"""
+
+import html
+import json
+import re
+import threading
+from dataclasses import dataclass
+from typing import Iterator, Optional
+from bs4 import BeautifulSoup, Tag
+from app.config import settings
+from app.core.http_fetch import looks_like_js_shell, parse_html, visible_text
+
+# Elements that never hold the posting itself
+_BOILERPLATE_TAGS = ("nav", "header", "footer", "aside", "form", "button", "iframe", "svg", "dialog")
+
+# id / class fragments of cookie banners, related-job lists, share bars etc.
+_BOILERPLATE_HINT_RE = re.compile(
+    r"cookie|consent|gdpr|banner|modal|popup|newsletter|subscribe|share|social|breadcrumb|"
+    r"related|similar|recommend|other-jobs|more-jobs|sidebar|footer|header|menu|navbar",
+    re.IGNORECASE,
+)
+
+# Elements whose text counts towards their ancestors' density score
+_TEXT_BLOCK_TAGS = ("p", "li", "pre", "td", "dd", "blockquote", "h2", "h3", "h4")
+
+# Shorter blocks (labels, buttons) carry no description content
+_MIN_BLOCK_CHARS = 25
+
+# Boilerplate candidates holding more of the page's text than this are page
+# wrappers (e.g. ASP.NET's page-wide <form>, "with-sidebar" layouts), not boilerplate
+_MAX_BOILERPLATE_SHARE = 0.5
+
+# Siblings of the best block scoring at least this share of it belong to the posting
+_SIBLING_SCORE_SHARE = 0.2
+
+
+@dataclass
+class ExtractedDescription:
+    """A job page's description and how it was found."""
+
+    text: str
+    method: str  # "json-ld", "selector", "density" or "page"
+    page_chars: int  # Length of the whole page's visible text
+    is_js_shell: bool  # The HTML holds no rendered content (see http_fetch)
+    location: Optional[str] = None  # From JSON-LD, when present
+
+
+class ExtractionStats:
+    """Process-wide counters of extraction methods and characters saved."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.page_chars = 0
+        self.extracted_chars = 0
+        self.by_method: dict[str, int] = {}
+
+    def record(self, extracted: ExtractedDescription) -> None:
+        """Counts a description the scraper kept."""
+        with self._lock:
+            self.pages += 1
+            self.page_chars += extracted.page_chars
+            self.extracted_chars += len(extracted.text)
+            self.by_method[extracted.method] = self.by_method.get(extracted.method, 0) + 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": settings.DESCRIPTION_EXTRACTION_ENABLED,
+                "pages": self.pages,
+                "by_method": dict(self.by_method),
+                "page_chars": self.page_chars,
+                "extracted_chars": self.extracted_chars,
+                "reduction": round(1 - self.extracted_chars / self.page_chars, 3) if self.page_chars else 0.0,
+            }
+
+
+def _json_ld_objects(soup: BeautifulSoup) -> Iterator[dict]:
+    """Yields every object of the page's JSON-LD blocks, `@graph` and ItemList members included."""
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.string or "")
+        except ValueError:
+            continue
+        pending = data if isinstance(data, list) else [data]
+        while pending:
+            item = pending.pop(0)
+            if isinstance(item, list):
+                pending.extend(item)
+            elif isinstance(item, dict):
+                yield item
+                for key in ("@graph", "itemListElement"):
+                    if isinstance(item.get(key), list):
+                        pending.extend(item[key])
+
+
+def _is_job_posting(item: dict) -> bool:
+    types = item.get("@type")
+    return "JobPosting" in (types if isinstance(types, list) else [types])
+
+
+def html_to_text(markup: str) -> str:
+    """
+    Converts an HTML fragment, possibly entity-escaped, to plain text.
+
+    Args:
+        markup: HTML as found in a JSON-LD description or an API response.
+
+    Returns:
+        The fragment's text, one block per line.
+    """
+    fragment = BeautifulSoup(html.unescape(markup), "html.parser")
+    for br in fragment.find_all("br"):
+        br.replace_with("\n")
+    return visible_text(fragment)
+
+
+def format_location(job_location) -> Optional[str]:
+    """
+    Renders a schema.org `jobLocation` (a Place, or a list of them) as text.
+
+    Args:
+        job_location: The `jobLocation` value of a JobPosting.
+
+    Returns:
+        "City, Region, Country" per place, places joined by "; ", or None.
+    """
+    places = job_location if isinstance(job_location, list) else [job_location]
+    rendered = []
+    for place in places:
+        if isinstance(place, str):
+            rendered.append(place)
+            continue
+        if not isinstance(place, dict):
+            continue
+        address = place.get("address") or {}
+        if isinstance(address, str):
+            rendered.append(address)
+            continue
+        country = address.get("addressCountry")
+        if isinstance(country, dict):
+            country = country.get("name")
+        parts = [address.get("addressLocality"), address.get("addressRegion"), country]
+        text = ", ".join(str(part) for part in parts if part)
+        if text:
+            rendered.append(text)
+    return "; ".join(dict.fromkeys(rendered)) or None
+
+
+def job_postings_from_json_ld(soup: BeautifulSoup) -> list[dict]:
+    """
+    Collects the page's schema.org JobPostings.
+
+    Listing pages may embed one per job, in an ItemList or `@graph`.
+
+    Args:
+        soup: The parsed page.
+
+    Returns:
+        Dicts with 'title', 'url' (or None), 'description' (plain text) and
+        'location' (or None), for each JobPosting with a description.
+    """
+    postings = []
+    for item in _json_ld_objects(soup):
+        if isinstance(item.get("item"), dict):
+            item = item["item"]  # ListItem wrapper of an ItemList
+        if not _is_job_posting(item) or not isinstance(item.get("description"), str):
+            continue
+        location = format_location(item.get("jobLocation"))
+        if item.get("jobLocationType") == "TELECOMMUTE":
+            location = f"{location} (remote)" if location else "Remote"
+        postings.append({
+            "title": html.unescape(str(item.get("title") or "")).strip(),
+            "url": item.get("url") if isinstance(item.get("url"), str) else None,
+            "description": html_to_text(item["description"]),
+            "location": location,
+        })
+    return postings
+
+
+def _is_boilerplate(tag: Tag) -> bool:
+    if tag.name in _BOILERPLATE_TAGS or tag.get("role") in ("navigation", "banner", "contentinfo", "dialog"):
+        return True
+    if tag.get("aria-hidden") == "true" or tag.has_attr("hidden"):
+        return True
+    hints = " ".join([tag.get("id") or ""] + (tag.get("class") or []))
+    return bool(hints) and _BOILERPLATE_HINT_RE.search(hints) is not None
+
+
+def _strip_boilerplate(root: Tag) -> None:
+    max_chars = len(root.get_text(" ", strip=True)) * _MAX_BOILERPLATE_SHARE
+    # Collected first: decomposing while iterating skips elements
+    for tag in [tag for tag in root.find_all(True) if _is_boilerplate(tag)]:
+        if not tag.decomposed and len(tag.get_text(" ", strip=True)) < max_chars:
+            tag.decompose()
+
+
+def _link_density(tag: Tag, text_chars: int) -> float:
+    link_chars = sum(len(anchor.get_text(" ", strip=True)) for anchor in tag.find_all("a"))
+    return min(1.0, link_chars / text_chars) if text_chars else 1.0
+
+
+def densest_block_text(root: Tag) -> str:
+    """
+    Returns the text of the block holding most of the page's prose.
+
+    Each paragraph-like element scores its parent (and half for its
+    grandparent) by length and comma count; scores are discounted by link
+    density, so link lists and menus lose to prose. Siblings of the winner
+    that also score well are kept, for postings split into sections.
+
+    Args:
+        root: The page body with boilerplate removed.
+
+    Returns:
+        The block's visible text, or an empty string.
+    """
+    scores: dict[int, float] = {}
+    tags: dict[int, Tag] = {}
+    for block in root.find_all(_TEXT_BLOCK_TAGS):
+        text = block.get_text(" ", strip=True)
+        if len(text) < _MIN_BLOCK_CHARS:
+            continue
+        points = 1 + text.count(",") + min(len(text) // 100, 3)
+        for ancestor, share in ((block.parent, 1.0), (block.parent.parent if block.parent else None, 0.5)):
+            if isinstance(ancestor, Tag):
+                tags[id(ancestor)] = ancestor
+                scores[id(ancestor)] = scores.get(id(ancestor), 0.0) + points * share
+    if not scores:
+        return ""
+
+    for key, tag in tags.items():
+        scores[key] *= 1 - _link_density(tag, len(tag.get_text(" ", strip=True)))
+    best_key = max(scores, key=scores.get)
+    best = tags[best_key]
+    if best.parent is None:
+        return visible_text(best)
+
+    threshold = max(scores[best_key] * _SIBLING_SCORE_SHARE, 1.0)
+    parts = [
+        visible_text(sibling) for sibling in best.parent.find_all(True, recursive=False)
+        if sibling is best or scores.get(id(sibling), 0.0) >= threshold
+    ]
+    return "\n\n".join(part for part in parts if part)
+
+
+def extract_description(html_text: str, selector: Optional[str] = None) -> ExtractedDescription:
+    """
+    Extracts the description of a job detail page.
+
+    CPU-bound; the scraper runs it in a worker thread.
+
+    Args:
+        html_text: The page's HTML (served, or as rendered by the browser).
+        selector: The company's CSS selector for the description, if any.
+
+    Returns:
+        The description, the method that found it, and the page's full text
+        length for comparison. Callers keeping it report it to
+        `extraction_stats`.
+    """
+    soup = parse_html(html_text)
+    page_text = visible_text(soup)
+    is_js_shell = looks_like_js_shell(soup, page_text)
+    min_chars = settings.DESCRIPTION_MIN_CHARS
+
+    def result(text: str, method: str, location: Optional[str] = None) -> ExtractedDescription:
+        return ExtractedDescription(text, method, len(page_text), is_js_shell, location)
+
+    if not settings.DESCRIPTION_EXTRACTION_ENABLED:
+        return result(page_text, "page")
+
+    postings = job_postings_from_json_ld(soup)
+    if postings and len(postings[0]["description"]) >= min_chars:
+        return result(postings[0]["description"], "json-ld", postings[0]["location"])
+
+    if selector:
+        matches = soup.select(selector)
+        text = "\n\n".join(filter(None, (visible_text(match) for match in matches)))
+        if len(text) >= min_chars:
+            return result(text, "selector")
+
+    root = soup.body or soup
+    _strip_boilerplate(root)
+    text = densest_block_text(root)
+    if len(text) >= min_chars:
+        return result(text, "density")
+    return result(page_text, "page")
+
+
+extraction_stats = ExtractionStats()
@@ -0,0 +1,103 @@
+"""
+Change detection for career pages.
+
+A company is skipped early when its career page has not changed since the
+last complete scan: either the server confirms it via ETag/Last-Modified
+(a conditional request, no parsing), or the page yields exactly the same
+set of candidate job links as last time. Validators are only used for pages
+whose job links are in the served HTML; on pages rendered by JavaScript
+they cover the HTML shell, not the job list.
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from app.config import settings
+from app.db.models import Company
+
+
+def link_fingerprint(hrefs: Iterable[str]) -> str:
+    """
+    Hashes a set of job link URLs, ignoring order and duplicates.
+
+    Args:
+        hrefs: The candidate job link URLs found on the career page.
+
+    Returns:
+        A hex sha256 digest of the sorted unique URLs.
+    """
+    digest = hashlib.sha256()
+    for href in sorted(set(hrefs)):
+        digest.update(href.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def conditional_headers(company: Company) -> dict[str, str]:
+    """
+    Builds If-None-Match / If-Modified-Since headers for a career page.
+
+    Validators are only sent for companies whose job links are read from
+    the served HTML (fetch_strategy "http"), since a JavaScript-rendered
+    page can change its job list without its HTML shell changing, and only
+    while the last complete scan is recent (INCREMENTAL_SCAN_MAX_SKIP_HOURS).
+
+    Args:
+        company: The company about to be scanned.
+
+    Returns:
+        The conditional request headers, or an empty dict if the page must
+        be loaded regardless.
+    """
+    if not settings.INCREMENTAL_SCAN_ENABLED or company.page_verified_at is None:
+        return {}
+    if company.fetch_strategy != "http":
+        return {}
+    max_age = timedelta(hours=settings.INCREMENTAL_SCAN_MAX_SKIP_HOURS)
+    if datetime.now() - company.page_verified_at > max_age:
+        return {}
+
+    headers = {}
+    if company.page_etag:
+        headers["If-None-Match"] = company.page_etag
+    if company.page_last_modified:
+        headers["If-Modified-Since"] = company.page_last_modified
+    return headers
+
+
+def is_not_modified(company: Company, status: int, headers: dict[str, str]) -> bool:
+    """
+    Interprets the response to a conditional request.
+
+    Args:
+        company: The company whose validators were sent.
+        status: HTTP status of the response.
+        headers: Response headers (lowercase names).
+
+    Returns:
+        True if the page is unchanged: a 304, or a 200 echoing the same
+        strong ETag from a server that ignores conditional requests.
+    """
+    if status == 304:
+        return True
+    etag = headers.get("etag")
+    return (
+        status == 200
+        and bool(etag)
+        and not etag.startswith("W/")
+        and etag == company.page_etag
+    )
+
+
+def page_validators(headers: Optional[dict[str, str]]) -> tuple[Optional[str], Optional[str]]:
+    """
+    Extracts the cache validators from a career page response.
+
+    Args:
+        headers: Response headers (lowercase names), or None.
+
+    Returns:
+        Tuple of (etag, last_modified); either may be None.
+    """
+    headers = headers or {}
+    return headers.get("etag"), headers.get("last-modified")
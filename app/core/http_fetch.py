@@ -0,0 +1,186 @@
+"""
+Plain HTTP fetching and HTML parsing for career pages.
+
+Many career pages (ATS boards, static sites) are fully server-rendered, so
+a single HTTP request plus an HTML parse yields the same links and text as
+a headless browser at a fraction of the CPU and memory. Pages that turn
+out to be JavaScript shells are left to the browser.
+"""
+
+import asyncio
+import re
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urljoin
+import httpx
+from bs4 import BeautifulSoup, Comment
+from app.config import settings
+
+# Tags whose text is never rendered
+_INVISIBLE_TAGS = frozenset({"script", "style", "noscript", "template", "head", "title", "meta"})
+
+# Mount points of client-side rendered apps (React, Vue, Next, Nuxt, Gatsby, Angular)
+_APP_ROOT_IDS = re.compile(r"^(root|app|__next|__nuxt|___gatsby|app-root)$")
+
+# Pages with less visible text than this were almost certainly rendered by JavaScript
+_MIN_TEXT_CHARS = 250
+
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+
+
+class HttpFetcher:
+    """
+    Process-wide async HTTP client for career and job pages.
+
+    The client is created lazily on first use and re-created if the event
+    loop changes (e.g. between `asyncio.run` calls in scripts).
+    """
+
+    def __init__(self, timeout: float, user_agent: str):
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers={"User-Agent": self.user_agent},
+            )
+            self._loop = loop
+        return self._client
+
+    async def get(self, url: str, headers: Optional[dict[str, str]] = None) -> httpx.Response:
+        """
+        Fetches a URL.
+
+        Args:
+            url: The URL to fetch.
+            headers: Extra request headers.
+
+        Returns:
+            The response; 4xx/5xx statuses are not raised.
+        """
+        return await self._get_client().get(url, headers=headers)
+
+    async def post(self, url: str, json: dict) -> httpx.Response:
+        """
+        Posts a JSON body to a URL (e.g. an ATS search API).
+
+        Args:
+            url: The URL to post to.
+            json: The request body.
+
+        Returns:
+            The response; 4xx/5xx statuses are not raised.
+        """
+        return await self._get_client().post(url, json=json)
+
+    async def stop(self) -> None:
+        """Close the underlying client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+
+def parse_html(html: str) -> BeautifulSoup:
+    """Parses an HTML document with the stdlib-backed parser."""
+    return BeautifulSoup(html, "html.parser")
+
+
+def extract_links(soup: BeautifulSoup, base_url: str) -> list[dict]:
+    """
+    Collects the page's links in the same shape as the browser extraction.
+
+    Args:
+        soup: The parsed page.
+        base_url: URL the page was served from, for resolving relative links.
+
+    Returns:
+        A list of dicts with 'text' and absolute 'href'.
+    """
+    links = []
+    for anchor in soup.find_all("a", href=True):
+        href = urljoin(base_url, anchor["href"].strip())
+        if len(href) > 10 and href.startswith(("http://", "https://")):
+            links.append({"text": anchor.get_text(" ", strip=True), "href": href})
+    return links
+
+
+def visible_text(soup: BeautifulSoup) -> str:
+    """
+    Approximates `document.body.innerText` for a parsed page.
+
+    Args:
+        soup: The parsed page.
+
+    Returns:
+        The page's visible text with blank lines collapsed.
+    """
+    root = soup.body or soup
+    parts = [
+        string.strip() for string in root.find_all(string=True)
+        if not isinstance(string, Comment)
+        and string.parent is not None
+        and string.parent.name not in _INVISIBLE_TAGS
+        and string.strip()
+    ]
+    return _BLANK_LINES_RE.sub("\n\n", "\n".join(parts)).strip()
+
+
+def looks_like_js_shell(soup: BeautifulSoup, text: str) -> bool:
+    """
+    Detects pages whose content is rendered client-side.
+
+    Args:
+        soup: The parsed page.
+        text: Its `visible_text`.
+
+    Returns:
+        True if the page has almost no text, or an empty app mount point.
+    """
+    if len(text) < _MIN_TEXT_CHARS:
+        return True
+    mount = soup.find(id=_APP_ROOT_IDS)
+    return mount is not None and not mount.get_text(strip=True)
+
+
+@dataclass
+class ParsedPage:
+    """What the scraper needs from a fetched HTML page."""
+
+    links: list[dict]
+    text: str
+    is_js_shell: bool
+
+
+def parse_page(html: str, base_url: str) -> ParsedPage:
+    """
+    Parses a page into links, visible text and a JavaScript-shell verdict.
+
+    CPU-bound; the scraper runs it in a worker thread.
+
+    Args:
+        html: The page's HTML.
+        base_url: URL the page was served from.
+
+    Returns:
+        The parsed page.
+    """
+    soup = parse_html(html)
+    text = visible_text(soup)
+    return ParsedPage(
+        links=extract_links(soup, base_url),
+        text=text,
+        is_js_shell=looks_like_js_shell(soup, text),
+    )
+
+
+http_fetcher = HttpFetcher(
+    timeout=settings.HTTP_TIMEOUT_SECONDS,
+    user_agent=settings.HTTP_USER_AGENT,
+)
@@ -0,0 +1,283 @@
+"""
+Candidate job link selection.
+
+A career page typically carries hundreds of links (navigation, footer,
+social, legal) around a few dozen job postings. The same rules run in two
+places: inside the browser page (`CANDIDATE_LINKS_SCRIPT`), so only the
+small deduplicated candidate set crosses the CDP boundary, and in Python
+(`select_candidate_links`) for pages fetched over plain HTTP. Both read
+their keyword lists from `link_rules()` so they cannot drift apart.
+"""
+
+import re
+from typing import Iterable, Optional
+from urllib.parse import quote, urlsplit, urlunsplit
+
+# Click IDs and campaign tags of known ad, email and ATS trackers. Generic
+# names such as "ref" or "source" are kept: some sites select the job by them.
+TRACKING_PARAMS = frozenset({
+    "gclid", "gbraid", "wbraid", "dclid", "fbclid", "msclkid", "yclid",
+    "twclid", "ttclid", "li_fat_id", "igshid", "mc_cid", "mc_eid", "_hsenc",
+    "_hsmkt", "_ga", "_gl", "gh_src", "lever-source", "lever-origin", "lever-via",
+})
+TRACKING_PARAM_PREFIXES = ("utm_", "pk_", "mtm_")
+
+# Words in a link's URL suggesting a job posting
+JOB_KEYWORDS = (
+    "job", "career", "position", "opening", "vacanc", "requisition",
+    "posting", "opportunit", "stelle", "empleo", "emploi",
+)
+
+# Words in a link's text naming a role ("Senior Backend Engineer"), matched
+# as whole words, optionally plural
+ROLE_WORDS = (
+    "engineer", "developer", "programmer", "architect", "administrator",
+    "analyst", "scientist", "designer", "researcher", "manager", "director",
+    "lead", "head", "consultant", "specialist", "coordinator", "technician",
+    "assistant", "associate", "officer", "representative", "executive",
+    "intern", "internship", "trainee", "apprentice", "nurse", "accountant",
+)
+
+# Words in a link's URL or text marking pages that are never job postings
+EXCLUDED_WORDS = (
+    "login", "log-in", "signin", "sign-in", "signup", "sign-up", "privacy",
+    "cookie", "cookies", "terms", "legal", "imprint", "impressum",
+    "accessibility", "sitemap",
+)
+
+# Links with a shorter text carry no title ("Apply", "More", icons)
+MIN_TITLE_CHARS = 10
+
+# Link texts are used as job titles, which are stored truncated to this
+MAX_TEXT_CHARS = 200
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_POSTING_ID_RE = re.compile(r"\d{4,}|[0-9a-f]{8}-[0-9a-f]{4}-", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+# Characters left unescaped in a canonical path, query or fragment: RFC 3986
+# unreserved and delimiter characters, minus the apostrophe (which browsers
+# escape in queries) and plus "%" (existing escapes are normalized separately)
+_UNESCAPED_CHARS = r"A-Za-z0-9\-._~!$&()*+,;=:@/?%"
+_ESCAPE_CHAR_RE = re.compile(f"[^{_UNESCAPED_CHARS}]")
+_PERCENT_ESCAPE_RE = re.compile(r"%([0-9A-Fa-f]{2})")
+_UNRESERVED_RE = re.compile(r"[A-Za-z0-9\-._~]")
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PARAM_PREFIXES)
+
+
+def _normalize_escapes(value: str) -> str:
+    """
+    Percent-encodes a URL component the same way whichever form it arrived in.
+
+    Characters outside `_UNESCAPED_CHARS` (spaces, quotes, non-ASCII) are
+    escaped as UTF-8, escapes of unreserved characters are decoded and the
+    remaining escapes are uppercased, so "/jobs/caf%c3%a9%2Dlead" and
+    "/jobs/café-lead" compare equal.
+    """
+    value = _ESCAPE_CHAR_RE.sub(lambda match: quote(match.group(), safe=""), value)
+
+    def normalize(match: re.Match) -> str:
+        char = chr(int(match.group(1), 16))
+        return char if _UNRESERVED_RE.fullmatch(char) else match.group().upper()
+
+    return _PERCENT_ESCAPE_RE.sub(normalize, value)
+
+
+def _has_role_word(text: str) -> bool:
+    words = set(_NON_WORD_RE.split(text.lower()))
+    return any(word in words or word + "s" in words for word in ROLE_WORDS)
+
+
+def _has_excluded_word(value: str) -> bool:
+    slug = "-" + _NON_WORD_RE.sub("-", value.lower()) + "-"
+    return any(f"-{word}-" in slug for word in EXCLUDED_WORDS)
+
+
+def canonicalize_url(url: str) -> Optional[str]:
+    """
+    Normalizes a link URL so equivalent links compare equal.
+
+    Lowercases scheme and host, drops default ports, tracking parameters
+    and fragments, and normalizes percent-encoding. Hash-router fragments
+    ("#/jobs/42", "#!/jobs/42") are kept, since they select the page on
+    single-page apps.
+
+    Args:
+        url: An absolute URL.
+
+    Returns:
+        The canonical URL, or None if it is not an http(s) URL.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS or not parts.hostname:
+        return None
+
+    host = parts.hostname
+    if ":" in host:
+        host = f"[{host}]"
+    netloc = host if port in (None, _DEFAULT_PORTS[scheme]) else f"{host}:{port}"
+
+    query = "&".join(
+        pair for pair in _normalize_escapes(parts.query).split("&")
+        if pair and not _is_tracking_param(pair.split("=", 1)[0])
+    )
+    fragment = _normalize_escapes(parts.fragment) if parts.fragment.startswith(("/", "!")) else ""
+    return urlunsplit((scheme, netloc, _normalize_escapes(parts.path) or "/", query, fragment))
+
+
+def job_link_score(text: str, url: str) -> int:
+    """
+    Rates how likely a link points to a job posting.
+
+    A link needs a job signal: a job keyword or posting ID in its URL, or a
+    role word in its text. Links without one score 0 whatever their text
+    length, so navigation, footer and blog links are not candidates.
+
+    Args:
+        text: The link's text, whitespace collapsed.
+        url: The link's canonical URL.
+
+    Returns:
+        A score; links scoring 0 or less are not candidates.
+    """
+    parts = urlsplit(url)
+    target = f"{parts.path}?{parts.query}#{parts.fragment}".lower()
+
+    score = 0
+    if any(keyword in target for keyword in JOB_KEYWORDS):
+        score += 2
+    if _POSTING_ID_RE.search(target):
+        score += 1
+    if _has_role_word(text):
+        score += 2
+    if score == 0:
+        return 0
+    if len(text) > MIN_TITLE_CHARS:
+        score += 1
+    if _has_excluded_word(target) or _has_excluded_word(text):
+        score -= 3
+    return score
+
+
+def select_candidate_links(links: Iterable[dict], page_url: Optional[str] = None) -> list[dict]:
+    """
+    Filters a page's links down to deduplicated job link candidates.
+
+    Args:
+        links: Dicts with 'text' and absolute 'href', in document order.
+        page_url: URL of the page itself; links back to it are dropped.
+
+    Returns:
+        Dicts with 'text', canonical 'href' and 'score', in document order
+        of first appearance. Duplicates keep the longest text.
+    """
+    own_url = canonicalize_url(page_url) if page_url else None
+    candidates: dict[str, dict] = {}
+    for link in links:
+        href = canonicalize_url(link["href"])
+        if href is None or href == own_url:
+            continue
+        text = _WHITESPACE_RE.sub(" ", link.get("text") or "").strip()[:MAX_TEXT_CHARS]
+        existing = candidates.get(href)
+        if existing is not None:
+            if len(text) > len(existing["text"]):
+                existing["text"] = text
+                existing["score"] = max(existing["score"], job_link_score(text, href))
+            continue
+        candidates[href] = {"text": text, "href": href, "score": job_link_score(text, href)}
+    return [link for link in candidates.values() if link["score"] > 0]
+
+
+def link_rules() -> dict:
+    """The rules above, as the argument of `CANDIDATE_LINKS_SCRIPT`."""
+    return {
+        "trackingParams": sorted(TRACKING_PARAMS),
+        "trackingPrefixes": list(TRACKING_PARAM_PREFIXES),
+        "jobKeywords": list(JOB_KEYWORDS),
+        "roleWords": list(ROLE_WORDS),
+        "excludedWords": list(EXCLUDED_WORDS),
+        "minTitleChars": MIN_TITLE_CHARS,
+        "maxTextChars": MAX_TEXT_CHARS,
+        "postingIdPattern": _POSTING_ID_RE.pattern,
+        "unescapedChars": _UNESCAPED_CHARS,
+    }
+
+
+# In-page equivalent of `select_candidate_links`; called with `link_rules()`.
+# Uses textContent rather than innerText, which forces a layout per link.
+CANDIDATE_LINKS_SCRIPT = """(rules) => {
+    const tracking = new Set(rules.trackingParams);
+    const postingId = new RegExp(rules.postingIdPattern, 'i');
+    const escapeChar = new RegExp('[^' + rules.unescapedChars + ']', 'gu');
+    const normalizeEscapes = value => value
+        .replace(escapeChar, c => encodeURIComponent(c).replace(/'/g, '%27'))
+        .replace(/%([0-9A-Fa-f]{2})/g, (escape, hex) => {
+            const c = String.fromCharCode(parseInt(hex, 16));
+            return /^[A-Za-z0-9\\-._~]$/.test(c) ? c : escape.toUpperCase();
+        });
+    const isTracking = name => {
+        name = name.toLowerCase();
+        return tracking.has(name) || rules.trackingPrefixes.some(p => name.startsWith(p));
+    };
+    const hasRoleWord = text => {
+        const words = new Set(text.toLowerCase().split(/[^a-z0-9]+/));
+        return rules.roleWords.some(word => words.has(word) || words.has(word + 's'));
+    };
+    const hasExcludedWord = value => {
+        const slug = '-' + value.toLowerCase().replace(/[^a-z0-9]+/g, '-') + '-';
+        return rules.excludedWords.some(word => slug.includes('-' + word + '-'));
+    };
+    const canonicalize = href => {
+        let url;
+        try { url = new URL(href); } catch (e) { return null; }
+        if (url.protocol !== 'http:' && url.protocol !== 'https:' || !url.hostname) return null;
+        const query = normalizeEscapes(url.search.replace(/^\\?/, '')).split('&')
+            .filter(pair => pair && !isTracking(pair.split('=')[0]))
+            .join('&');
+        const fragment = url.hash.replace(/^#/, '');
+        return url.protocol + '//' + url.host + (normalizeEscapes(url.pathname) || '/')
+            + (query ? '?' + query : '')
+            + (fragment.startsWith('/') || fragment.startsWith('!') ? '#' + normalizeEscapes(fragment) : '');
+    };
+    const score = (text, href) => {
+        const url = new URL(href);
+        const target = (url.pathname + '?' + url.search.replace(/^\\?/, '') + '#'
+            + url.hash.replace(/^#/, '')).toLowerCase();
+        let value = 0;
+        if (rules.jobKeywords.some(k => target.includes(k))) value += 2;
+        if (postingId.test(target)) value += 1;
+        if (hasRoleWord(text)) value += 2;
+        if (value === 0) return 0;
+        if (text.length > rules.minTitleChars) value += 1;
+        if (hasExcludedWord(target) || hasExcludedWord(text)) value -= 3;
+        return value;
+    };
+
+    const ownUrl = canonicalize(location.href);
+    const candidates = new Map();
+    for (const anchor of document.querySelectorAll('a[href]')) {
+        const href = canonicalize(anchor.href);
+        if (!href || href === ownUrl) continue;
+        const text = (anchor.textContent || '').replace(/\\s+/g, ' ').trim().slice(0, rules.maxTextChars);
+        const existing = candidates.get(href);
+        if (existing) {
+            if (text.length > existing.text.length) {
+                existing.text = text;
+                existing.score = Math.max(existing.score, score(text, href));
+            }
+            continue;
+        }
+        candidates.set(href, {text, href, score: score(text, href)});
+    }
+    return Array.from(candidates.values()).filter(link => link.score > 0);
+}"""
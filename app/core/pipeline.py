@@ -0,0 +1,153 @@
+"""
+Staged asyncio pipeline used by the scraper.
+
+Each stage runs its own pool of workers and is connected to the next stage
+by a bounded queue, so a slow stage (usually LLM analysis) applies
+backpressure upstream instead of stalling the whole scrape.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, Awaitable, Callable, Optional
+
+# Marks the end of a stream on a stage queue
+_END = object()
+
+
+@dataclass
+class Stage:
+    """
+    A pipeline stage: an async worker applied to every item with N workers.
+
+    When `batch_size` is set the worker instead receives a list of up to
+    `batch_size` items (collected for at most `batch_wait` seconds) and must
+    return a list of results of the same length.
+    """
+
+    name: str
+    worker: Callable[[Any], Awaitable[Any]]
+    concurrency: int = 1
+    batch_size: Optional[int] = None
+    batch_wait: float = 0.5
+
+
+@dataclass
+class StageStats:
+    """Throughput counters for one stage."""
+
+    name: str
+    items_in: int = 0
+    items_out: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "stage": self.name,
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy_seconds, 2),
+        }
+
+
+async def run_pipeline(
+    source: AsyncIterable[Any],
+    stages: list[Stage],
+    queue_size: int
+) -> list[dict]:
+    """
+    Streams items from `source` through `stages`.
+
+    A worker returning None drops the item; anything else is passed to the
+    next stage. Exceptions raised by a worker are logged and the item is
+    dropped, so one bad item never stalls the pipeline.
+
+    Args:
+        source: Async iterable producing the items for the first stage.
+        stages: The stages, in order.
+        queue_size: Capacity of each inter-stage queue.
+
+    Returns:
+        Per-stage throughput counters.
+    """
+    queues = [asyncio.Queue(maxsize=max(1, queue_size)) for _ in stages]
+    stats = [StageStats(name=stage.name) for stage in stages]
+
+    async def feed() -> None:
+        async for item in source:
+            await queues[0].put(item)
+        await queues[0].put(_END)
+
+    async def take_batch(inbox: asyncio.Queue, stage: Stage) -> tuple[list, bool]:
+        """Collects up to batch_size items; the flag reports end of stream."""
+        first = await inbox.get()
+        if first is _END:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + stage.batch_wait
+        while len(batch) < max(1, stage.batch_size):
+            remaining = deadline - time.monotonic()
+            try:
+                # A get cancelled by the timeout leaves its item in the queue
+                item = inbox.get_nowait() if remaining <= 0 else await asyncio.wait_for(inbox.get(), remaining)
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+            if item is _END:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def work(index: int) -> None:
+        stage, stat = stages[index], stats[index]
+        inbox = queues[index]
+        outbox: Optional[asyncio.Queue] = queues[index + 1] if index + 1 < len(stages) else None
+        batched = stage.batch_size is not None
+        while True:
+            if batched:
+                batch, ended = await take_batch(inbox, stage)
+            else:
+                item = await inbox.get()
+                ended = item is _END
+                batch = [] if ended else [item]
+            if ended:
+                await inbox.put(_END)  # Let sibling workers see it too
+            if not batch:
+                return
+
+            stat.items_in += len(batch)
+            started = time.perf_counter()
+            try:
+                results = await stage.worker(batch) if batched else [await stage.worker(batch[0])]
+            except Exception as e:
+                stat.errors += len(batch)
+                print(f"  Pipeline stage '{stage.name}' failed: {e}")
+                results = []
+            finally:
+                stat.busy_seconds += time.perf_counter() - started
+            for result in results:
+                if result is not None:
+                    stat.items_out += 1
+                    if outbox is not None:
+                        await outbox.put(result)
+            if ended:
+                return
+
+    async def run_stage(index: int) -> None:
+        workers = max(1, stages[index].concurrency)
+        await asyncio.gather(*(work(index) for _ in range(workers)))
+        if index + 1 < len(stages):
+            await queues[index + 1].put(_END)
+
+    tasks = [asyncio.ensure_future(feed())]
+    tasks += [asyncio.ensure_future(run_stage(i)) for i in range(len(stages))]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    return [stat.as_dict() for stat in stats]
@@ -0,0 +1,115 @@
+"""
+Local relevance pre-filter for scraped job pages.
+
+Scores keyword overlap between the user profile and a job posting on the CPU,
+so navigation links, blog posts and obvious mismatches are rejected before
+any LLM call is made.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from app.config import settings
+from app.db.models import UserProfile
+
+# Keeps tech tokens such as "c++", "c#", "node.js" and "k8s" intact
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+# Common words that carry no signal about role fit
+_STOPWORDS = frozenset("""
+a about above after all also am an and any are as at be been being but by can could did do does
+doing for from had has have having he her here hers him his how i if in into is it its itself
+just me more most my no nor not of off on once only or other our ours out over own same she
+should so some such than that the their theirs them then there these they this those through
+to too under until up very was we were what when where which while who whom why will with
+would you your yours years year experience work working role team teams strong skills using
+based looking etc including new good great well able within across per via
+""".split())
+
+# Only the start of very long pages is scanned; postings front-load the essentials
+_MAX_JOB_CHARS = 20000
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Splits text into lowercase keyword tokens, dropping stopwords.
+
+    Args:
+        text: Any text.
+
+    Returns:
+        The keyword tokens, in order.
+    """
+    return [
+        token for token in _TOKEN_RE.findall((text or "").lower())
+        if token not in _STOPWORDS and not token.isdigit()
+    ]
+
+
+@dataclass
+class PrefilterResult:
+    """Outcome of the pre-filter for one job."""
+
+    score: float  # 0.0 - 1.0 share of the profile's keyword weight found in the job
+    matched_terms: int
+    passed: bool
+
+
+class ProfileMatcher:
+    """
+    Pre-computed profile keywords for scoring many jobs against one profile.
+
+    Each profile keyword is weighted by 1 + log(count), so terms repeated
+    across the resume and preferences count more than passing mentions.
+    """
+
+    def __init__(self, user_profile: UserProfile):
+        counts = Counter(tokenize(f"{user_profile.resume_text} {user_profile.preferences}"))
+        self.weights = {term: 1.0 + math.log(count) for term, count in counts.items()}
+        self.total_weight = sum(self.weights.values())
+
+    def score(self, title: str, job_text: str) -> PrefilterResult:
+        """
+        Scores one job against the profile.
+
+        Args:
+            title: The job title (link text).
+            job_text: The job description text.
+
+        Returns:
+            The overlap score, number of matched profile terms, and whether
+            the job should be sent to the LLM.
+        """
+        if not self.total_weight:
+            # Nothing to compare against; let the LLM decide
+            return PrefilterResult(score=1.0, matched_terms=0, passed=True)
+
+        job_terms = set(tokenize(f"{title} {(job_text or '')[:_MAX_JOB_CHARS]}"))
+        matched = [term for term in self.weights if term in job_terms]
+        score = sum(self.weights[term] for term in matched) / self.total_weight
+        passed = (
+            score >= settings.PREFILTER_MIN_SCORE
+            and len(matched) >= settings.PREFILTER_MIN_MATCHED_TERMS
+        )
+        return PrefilterResult(score=score, matched_terms=len(matched), passed=passed)
+
+
+def prefiltered_match_result(result: PrefilterResult) -> dict:
+    """
+    Builds the stored analysis for a job rejected by the pre-filter.
+
+    Args:
+        result: The rejecting pre-filter result.
+
+    Returns:
+        A result in `analyze_job_match` format with a low score.
+    """
+    return {
+        "match_score": min(int(result.score * 100), 10),
+        "reasoning": (
+            f"Pre-filtered: only {result.matched_terms} profile keywords found "
+            f"(overlap {result.score:.0%}); not sent for AI analysis."
+        ),
+        "missing_skills": [],
+    }
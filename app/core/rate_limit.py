@@ -0,0 +1,83 @@
+"""
+Client-side rate limiting for OpenRouter calls.
+
+A pair of token buckets (requests per minute and LLM tokens per minute)
+shared by every analyzer call, so concurrent scans stay under the
+provider's limits instead of collecting 429s.
+"""
+
+import asyncio
+import time
+from app.config import settings
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at a fixed rate."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if they are now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        """Take `amount` tokens from the bucket."""
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """
+    Requests/min and tokens/min limiter; a limit of 0 disables that bucket.
+
+    Waiters are served in arrival order.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self._requests = TokenBucket(requests_per_minute, requests_per_minute / 60) if requests_per_minute > 0 else None
+        self._tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60) if tokens_per_minute > 0 else None
+        self._lock = asyncio.Lock()
+        self.waited_seconds = 0.0
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Waits until one request carrying roughly `tokens` tokens may be sent.
+
+        Args:
+            tokens: Estimated prompt plus completion tokens for the request.
+        """
+        async with self._lock:
+            while True:
+                wait = 0.0
+                if self._requests is not None:
+                    wait = max(wait, self._requests.wait_time(1))
+                if self._tokens is not None:
+                    wait = max(wait, self._tokens.wait_time(tokens))
+                if wait <= 0:
+                    break
+                self.waited_seconds += wait
+                await asyncio.sleep(wait)
+
+            if self._requests is not None:
+                self._requests.consume(1)
+            if self._tokens is not None:
+                self._tokens.consume(tokens)
+
+
+openrouter_limiter = RateLimiter(
+    requests_per_minute=settings.OPENROUTER_REQUESTS_PER_MINUTE,
+    tokens_per_minute=settings.OPENROUTER_TOKENS_PER_MINUTE,
+)
@@ -0,0 +1,120 @@
+"""
+Page readiness detection for browser-rendered pages.
+
+`networkidle` never fires on pages with long-polling or analytics beacons
+and fires too early on job lists rendered after a delayed XHR. Instead, a
+page counts as ready once its company's job-list selector is attached, or
+once its DOM has stopped changing for a short quiet period, always within
+a hard cap.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+from playwright.async_api import Error as PlaywrightError, Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from app.config import settings
+
+# Resolves once no DOM mutation has happened for quietMs, or after maxMs
+_DOM_STABLE_SCRIPT = """({quietMs, maxMs}) => new Promise(resolve => {
+    const started = performance.now();
+    let quietTimer = null;
+    let capTimer = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => finish(true), quietMs);
+    });
+    function finish(stable) {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(capTimer);
+        resolve({stable, elapsedMs: performance.now() - started});
+    }
+    observer.observe(document.documentElement || document, {
+        childList: true, subtree: true, characterData: true
+    });
+    quietTimer = setTimeout(() => finish(true), quietMs);
+    capTimer = setTimeout(() => finish(false), maxMs);
+})"""
+
+
+@dataclass
+class ReadinessResult:
+    """How a page was judged ready and how long that took."""
+
+    strategy: str  # "selector" or "dom-stable"
+    waited_seconds: float
+    timed_out: bool  # The hard cap was hit before the page settled
+
+
+class ReadinessStats:
+    """Process-wide wait time counters per readiness strategy."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_strategy: dict[str, dict] = {}
+
+    def record(self, result: ReadinessResult) -> None:
+        with self._lock:
+            entry = self._by_strategy.setdefault(
+                result.strategy, {"pages": 0, "total_wait_seconds": 0.0, "max_wait_seconds": 0.0, "timeouts": 0}
+            )
+            entry["pages"] += 1
+            entry["total_wait_seconds"] += result.waited_seconds
+            entry["max_wait_seconds"] = max(entry["max_wait_seconds"], result.waited_seconds)
+            entry["timeouts"] += int(result.timed_out)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                strategy: {
+                    "pages": entry["pages"],
+                    "avg_wait_seconds": round(entry["total_wait_seconds"] / entry["pages"], 3),
+                    "max_wait_seconds": round(entry["max_wait_seconds"], 3),
+                    "timeouts": entry["timeouts"],
+                }
+                for strategy, entry in self._by_strategy.items()
+            }
+
+
+async def wait_until_ready(page: Page, selector: Optional[str] = None) -> ReadinessResult:
+    """
+    Waits until a freshly navigated page has rendered its content.
+
+    Args:
+        page: A page after `goto(..., wait_until="domcontentloaded")`.
+        selector: CSS selector of the job list, if known for the company.
+
+    Returns:
+        The strategy used, the time waited and whether the cap was hit.
+        Hitting the cap is not an error; the page is read as it is.
+    """
+    started = time.perf_counter()
+    max_ms = int(settings.READINESS_MAX_SECONDS * 1000)
+    timed_out = False
+
+    if selector:
+        strategy = "selector"
+        try:
+            await page.wait_for_selector(selector, state="attached", timeout=max_ms)
+        except PlaywrightTimeoutError:
+            timed_out = True
+            print(f"  Ready selector '{selector}' not found on {page.url} within {settings.READINESS_MAX_SECONDS}s")
+    else:
+        strategy = "dom-stable"
+        try:
+            outcome = await page.evaluate(
+                _DOM_STABLE_SCRIPT, {"quietMs": settings.READINESS_QUIET_MS, "maxMs": max_ms}
+            )
+            timed_out = not outcome.get("stable", False)
+        except PlaywrightError:
+            # The page navigated (e.g. a client-side redirect) while we waited
+            timed_out = True
+
+    result = ReadinessResult(strategy, time.perf_counter() - started, timed_out)
+    readiness_stats.record(result)
+    return result
+
+
+readiness_stats = ReadinessStats()
@@ -0,0 +1,156 @@
+"""
+Request interception for scrape browser contexts.
+
+Images, fonts, media and known tracker domains are aborted before they are
+requested: they never affect the text or links the scraper reads, but they
+dominate page weight and keep `networkidle` from firing on ad-heavy sites.
+Companies can exempt domains (allow list) or block extra ones (deny list).
+"""
+
+import threading
+from typing import Iterable, Optional
+from urllib.parse import urlparse
+from playwright.async_api import BrowserContext, Route
+from app.config import settings
+from app.db.models import Company
+
+# Analytics, ad and session-recording hosts (subdomains included)
+TRACKER_DOMAINS = frozenset({
+    "google-analytics.com", "googletagmanager.com", "googleadservices.com",
+    "googlesyndication.com", "doubleclick.net", "facebook.net", "connect.facebook.net",
+    "hotjar.com", "hotjar.io", "segment.io", "segment.com", "mixpanel.com",
+    "fullstory.com", "amplitude.com", "heap.io", "heapanalytics.com", "clarity.ms",
+    "bat.bing.com", "linkedin.com/px", "snap.licdn.com", "ads.linkedin.com",
+    "adroll.com", "quantserve.com", "scorecardresearch.com", "newrelic.com",
+    "nr-data.net", "optimizely.com", "crazyegg.com", "mouseflow.com", "intercom.io",
+    "intercomcdn.com", "drift.com", "hs-analytics.net", "hs-scripts.com",
+    "hsadspixel.net", "tiktok.com/i18n/pixel", "analytics.tiktok.com",
+})
+
+# Typical transfer sizes, used to estimate what an aborted request would have cost
+_ESTIMATED_BYTES = {
+    "image": 35_000,
+    "font": 40_000,
+    "media": 500_000,
+    "script": 45_000,
+    "stylesheet": 15_000,
+}
+_DEFAULT_ESTIMATED_BYTES = 5_000
+
+
+def _split_setting(value: str) -> list[str]:
+    return [item.strip().lower() for item in value.split(",") if item.strip()]
+
+
+def _matches_domain(host: str, url_path: str, domains: Iterable[str]) -> bool:
+    """True if host (or host + path for entries with a path) falls under any entry."""
+    for domain in domains:
+        if "/" in domain:
+            domain_host, _, path_prefix = domain.partition("/")
+            if (host == domain_host or host.endswith("." + domain_host)) and url_path.startswith("/" + path_prefix):
+                return True
+        elif host == domain or host.endswith("." + domain):
+            return True
+    return False
+
+
+class BlockingStats:
+    """Process-wide counters of intercepted requests."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.blocked_requests = 0
+        self.allowed_requests = 0
+        self.estimated_bytes_saved = 0
+        self.blocked_by_type: dict[str, int] = {}
+
+    def add(self, blocked: int, allowed: int, bytes_saved: int, by_type: dict[str, int]) -> None:
+        with self._lock:
+            self.blocked_requests += blocked
+            self.allowed_requests += allowed
+            self.estimated_bytes_saved += bytes_saved
+            for resource_type, count in by_type.items():
+                self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + count
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": settings.RESOURCE_BLOCKING_ENABLED,
+                "blocked_requests": self.blocked_requests,
+                "allowed_requests": self.allowed_requests,
+                "estimated_bytes_saved": self.estimated_bytes_saved,
+                "blocked_by_type": dict(self.blocked_by_type),
+            }
+
+
+class ResourceBlocker:
+    """
+    Route handler deciding, per request, whether a context may fetch it.
+
+    Precedence: the company's allow list, then its deny list, then the
+    blocked resource types and tracker domains.
+    """
+
+    def __init__(
+        self,
+        allowed_domains: Optional[Iterable[str]] = None,
+        denied_domains: Optional[Iterable[str]] = None
+    ):
+        self.allowed_domains = [d.lower() for d in (allowed_domains or [])]
+        self.denied_domains = [d.lower() for d in (denied_domains or [])] + _split_setting(settings.BLOCKED_DOMAINS)
+        self.blocked_types = frozenset(_split_setting(settings.BLOCKED_RESOURCE_TYPES))
+        self.blocked = 0
+        self.allowed = 0
+        self.estimated_bytes_saved = 0
+        self.blocked_by_type: dict[str, int] = {}
+
+    @classmethod
+    def for_company(cls, company: Company) -> "ResourceBlocker":
+        """Builds a blocker using the company's allow and deny lists."""
+        return cls(company.allowed_domains, company.blocked_domains)
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        """
+        Decides whether a request is aborted.
+
+        Args:
+            url: The request URL.
+            resource_type: Playwright resource type ("image", "script", ...).
+
+        Returns:
+            True if the request should be aborted.
+        """
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https"):
+            return False  # data:, blob: etc. never hit the network
+        host = (parsed.hostname or "").lower()
+        if _matches_domain(host, parsed.path, self.allowed_domains):
+            return False
+        if _matches_domain(host, parsed.path, self.denied_domains):
+            return True
+        if resource_type in self.blocked_types:
+            return True
+        return _matches_domain(host, parsed.path, TRACKER_DOMAINS)
+
+    async def handle(self, route: Route) -> None:
+        """Playwright route handler: abort or continue the request."""
+        request = route.request
+        if self.should_block(request.url, request.resource_type):
+            self.blocked += 1
+            self.blocked_by_type[request.resource_type] = self.blocked_by_type.get(request.resource_type, 0) + 1
+            self.estimated_bytes_saved += _ESTIMATED_BYTES.get(request.resource_type, _DEFAULT_ESTIMATED_BYTES)
+            await route.abort("blockedbyclient")
+        else:
+            self.allowed += 1
+            await route.continue_()
+
+    async def install(self, context: BrowserContext) -> None:
+        """Intercepts every request made by pages of `context`."""
+        await context.route("**/*", self.handle)
+
+    def report(self) -> None:
+        """Adds this blocker's counters to the process-wide totals."""
+        blocking_stats.add(self.blocked, self.allowed, self.estimated_bytes_saved, self.blocked_by_type)
+
+
+blocking_stats = BlockingStats()
@@ -4,41 +4,119 @@ Background job scheduler using APScheduler.
 Manages the daily scan job that checks all active companies for new listings.
 """
 
+import asyncio
+import time
+from typing import Optional
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from sqlmodel import Session, select
+from sqlmodel import select
 from datetime import datetime
-from app.db.database import engine
+from app.config import settings
+from app.db.database import async_session
 from app.db.models import Company
-from app.core.scraper import scrape_company
+from app.core.resource_blocking import blocking_stats
+from app.core.scraper import scrape_company, rescore_pending_jobs
 
 scheduler = AsyncIOScheduler()
 
+# Summary of the most recent scan, exposed via the metrics router
+last_scan_summary: Optional[dict] = None
 
-async def run_daily_scan() -> None:
+
+async def _scan_one(company: Company, semaphore: asyncio.Semaphore) -> dict:
+    """
+    Scrapes one company under the global concurrency limit and times it.
+
+    Args:
+        company: The company to scrape.
+        semaphore: Semaphore bounding how many companies run at once.
+
+    Returns:
+        A dict describing the outcome and duration for this company.
+    """
+    async with semaphore:
+        started = time.perf_counter()
+        status = "ok"
+        new_jobs = 0
+        try:
+            new_jobs = await asyncio.wait_for(
+                scrape_company(company),
+                timeout=settings.SCAN_COMPANY_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            status = "timeout"
+            print(f"Scrape for {company.name} timed out after {settings.SCAN_COMPANY_TIMEOUT_SECONDS}s")
+        except Exception:
+            status = "error"  # Already logged by scrape_company
+        return {
+            "company_id": company.id,
+            "company": company.name,
+            "status": status,
+            "new_jobs": new_jobs,
+            "duration_seconds": round(time.perf_counter() - started, 2),
+        }
+
+
+async def run_daily_scan() -> dict:
     """
     Runs the daily job scan for all active companies.
-    
-    Iterates through all active companies and scrapes their career pages
-    sequentially to avoid overloading local resources.
+
+    Companies are scraped concurrently, bounded by SCAN_CONCURRENCY
+    (set it to 1 for a sequential scan), and each company is cut off
+    after SCAN_COMPANY_TIMEOUT_SECONDS.
+
+    Returns:
+        A summary of the scan with per-company durations.
     """
-    print(f"Running Daily Scan at {datetime.now()}")
-    with Session(engine) as session:
-        companies = session.exec(
+    global last_scan_summary
+    started_at = datetime.now()
+    print(f"Running Daily Scan at {started_at}")
+
+    async with async_session() as session:
+        companies = (await session.exec(
             select(Company).where(Company.is_active == True)
-        ).all()
-        for company in companies:
-            # We run sequentially to avoid overloading local resources,
-            # but this could be parallelized with asyncio.gather
-            await scrape_company(company)
-    print("Daily Scan Complete")
+        )).all()
+
+    started = time.perf_counter()
+    blocking_before = blocking_stats.stats()
+    semaphore = asyncio.Semaphore(max(1, settings.SCAN_CONCURRENCY))
+    results = await asyncio.gather(
+        *(_scan_one(company, semaphore) for company in companies)
+    )
+
+    results = sorted(results, key=lambda r: r["duration_seconds"], reverse=True)
+    blocking_after = blocking_stats.stats()
+    last_scan_summary = {
+        "started_at": started_at.isoformat(),
+        "duration_seconds": round(time.perf_counter() - started, 2),
+        "concurrency": max(1, settings.SCAN_CONCURRENCY),
+        "companies_scanned": len(results),
+        "new_jobs": sum(r["new_jobs"] for r in results),
+        "timeouts": sum(1 for r in results if r["status"] == "timeout"),
+        "errors": sum(1 for r in results if r["status"] == "error"),
+        "blocked_requests": blocking_after["blocked_requests"] - blocking_before["blocked_requests"],
+        "estimated_bytes_saved": (
+            blocking_after["estimated_bytes_saved"] - blocking_before["estimated_bytes_saved"]
+        ),
+        "companies": results,
+    }
+
+    print(
+        f"Daily Scan Complete: {last_scan_summary['companies_scanned']} companies, "
+        f"{last_scan_summary['new_jobs']} new jobs in {last_scan_summary['duration_seconds']}s"
+    )
+    for result in results[:5]:
+        print(f"  {result['company']}: {result['duration_seconds']}s ({result['status']})")
+    return last_scan_summary
 
 
 def start_scheduler() -> None:
     """
     Starts the APScheduler with a 24-hour interval job.
-    
-    The scheduler runs the daily scan every 24 hours.
+
+    The scheduler runs the daily scan every 24 hours and retries failed
+    analyses every PENDING_RESCORE_INTERVAL_MINUTES.
     """
     scheduler.add_job(run_daily_scan, 'interval', hours=24)
+    scheduler.add_job(rescore_pending_jobs, 'interval', minutes=settings.PENDING_RESCORE_INTERVAL_MINUTES)
     # scheduler.add_job(run_daily_scan, 'date')  # Run immediately on start for testing?
     scheduler.start()
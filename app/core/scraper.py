@@ -2,110 +2,644 @@
 Web scraper engine using Playwright for career page automation.
 
 Handles browser automation, job link extraction, and deep analysis.
+A company scrape runs as a staged pipeline: link discovery -> detail fetch
+-> local pre-filter -> analysis -> database write.
+
+Pages are fetched with a plain HTTP request when the company's career page
+is server-rendered, and with a pooled browser context otherwise.
 """
 
 import asyncio
-from playwright.async_api import async_playwright
-from sqlmodel import Session, select
-from datetime import datetime
-from app.db.models import Company, JobListing, UserProfile
-from app.db.database import get_session, engine
-from app.core.analyzer import analyze_job_match, analyze_navigation_step
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncIterator, Optional
+from urllib.parse import urlparse
+import httpx
+from playwright.async_api import BrowserContext
+from sqlalchemy import or_, update
+from sqlmodel import select
+from datetime import datetime, timedelta
+from app.config import settings
+from app.db.models import Company, JobDescription, JobListing, UserProfile, decompress_text
+from app.db.database import async_session
+from app.db.repository import (
+    JobListingWriter, filter_unseen_urls, get_cached_analysis, store_cached_analysis
+)
+from app.core.analyzer import (
+    analyze_job_matches_batch, analyze_navigation_step, analysis_cache_key, get_client
+)
+from app.core.ats import detect_ats, fetch_ats_postings, fetch_posting_detail, merge_json_ld_postings
+from app.core.browser_pool import browser_pool
+from app.core.extraction import extract_description, extraction_stats
+from app.core.fingerprint import conditional_headers, is_not_modified, link_fingerprint, page_validators
+from app.core.http_fetch import http_fetcher, parse_page
+from app.core.links import CANDIDATE_LINKS_SCRIPT, link_rules, select_candidate_links
+from app.core.pipeline import Stage, run_pipeline
+from app.core.prefilter import ProfileMatcher, prefiltered_match_result
+from app.core.readiness import wait_until_ready
+from app.core.resource_blocking import ResourceBlocker
+
+# Per-host limits shared by every company scrape, so sites hosting many
+# companies (e.g. ATS boards) are not hammered by concurrent scans.
+_host_semaphores: dict[str, asyncio.Semaphore] = {}
+_host_semaphores_loop = None
+
+# Failures of a plain HTTP fetch after which the browser is used instead
+# (httpx.InvalidURL and malformed URLs are not httpx.HTTPErrors)
+_HTTP_FETCH_ERRORS = (httpx.HTTPError, httpx.InvalidURL, ValueError)
+
+# Analyses currently awaiting the LLM, keyed by analysis cache key
+_inflight_analyses: dict[str, asyncio.Future] = {}
+
+
+@asynccontextmanager
+async def _host_slot(url: str) -> AsyncIterator[None]:
+    """
+    Holds one of the PER_HOST_CONCURRENCY slots for the URL's host.
+    
+    Args:
+        url: The URL about to be fetched.
+    """
+    global _host_semaphores_loop
+    loop = asyncio.get_running_loop()
+    if _host_semaphores_loop is not loop:
+        # Semaphores are bound to the loop they were first used on
+        _host_semaphores.clear()
+        _host_semaphores_loop = loop
+    
+    host = urlparse(url).netloc.lower()
+    semaphore = _host_semaphores.get(host)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(1, settings.PER_HOST_CONCURRENCY))
+        _host_semaphores[host] = semaphore
+    async with semaphore:
+        yield
+
+
+class _LazyBrowserContext:
+    """
+    Borrows a browser context from the pool the first time a page needs one.
+    
+    Companies scraped over plain HTTP never touch the browser pool. The
+    context blocks unneeded requests per RESOURCE_BLOCKING_ENABLED.
+    """
+    
+    def __init__(self, company: Company):
+        self.company = company
+        self.blocker: Optional[ResourceBlocker] = None
+        self._stack = AsyncExitStack()
+        self._context: Optional[BrowserContext] = None
+        self._lock = asyncio.Lock()
+    
+    async def get(self) -> BrowserContext:
+        async with self._lock:
+            if self._context is None:
+                context = await self._stack.enter_async_context(browser_pool.context())
+                if settings.RESOURCE_BLOCKING_ENABLED:
+                    self.blocker = ResourceBlocker.for_company(self.company)
+                    await self.blocker.install(context)
+                self._context = context
+        return self._context
+    
+    async def __aenter__(self) -> "_LazyBrowserContext":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        if self.blocker is not None:
+            self.blocker.report()
+        return await self._stack.__aexit__(*exc_info)
+
+
+async def _fetch_job_page(
+    link: dict,
+    company: Company,
+    strategy: str,
+    browser: _LazyBrowserContext
+) -> dict:
+    """
+    Pipeline stage: opens a job detail page and extracts its description.
+    
+    Links listed with their description (ATS APIs, JSON-LD on the career
+    page) pass straight through, and Workday postings are read from its
+    JSON API, falling back to the posting page if that fails. With the
+    "http" strategy the page is fetched and parsed without a browser; pages
+    that turn out to need JavaScript fall back to the browser unless their
+    JSON-LD already carries the description.
+    
+    Args:
+        link: The candidate link with 'text' and 'href'.
+        company: The company the job belongs to.
+        strategy: The company's fetch strategy ("http", "browser" or the ATS).
+        browser: The company's lazily borrowed browser context.
+    
+    Returns:
+        The link dict extended with 'description_text' and 'location'.
+    """
+    if link.get('description_text') is not None:
+        return link
+    if link.get('detail_url'):
+        async with _host_slot(link['detail_url']):
+            detail = await fetch_posting_detail(link)
+        if detail is not None:
+            return {**link, **detail}
+    
+    if strategy == "http":
+        try:
+            async with _host_slot(link['href']):
+                response = await http_fetcher.get(link['href'])
+            response.raise_for_status()
+            extracted = await asyncio.to_thread(
+                extract_description, response.text, company.description_selector
+            )
+            if not extracted.is_js_shell or extracted.method == "json-ld":
+                extraction_stats.record(extracted)
+                location = extracted.location or link.get('location')
+                return {**link, "description_text": extracted.text, "location": location}
+        except _HTTP_FETCH_ERRORS as e:
+            print(f"  HTTP fetch of {link['href']} failed ({e}); using the browser.")
+    
+    context = await browser.get()
+    async with _host_slot(link['href']):
+        job_page = await context.new_page()
+        try:
+            await job_page.goto(link['href'], wait_until="domcontentloaded")
+            await wait_until_ready(job_page)
+            rendered_html = await job_page.content()
+        finally:
+            await job_page.close()
+    extracted = await asyncio.to_thread(extract_description, rendered_html, company.description_selector)
+    extraction_stats.record(extracted)
+    return {**link, "description_text": extracted.text, "location": extracted.location or link.get('location')}
+
+
+async def score_job_texts(
+    job_texts: list[str],
+    user_profile: UserProfile
+) -> list[dict]:
+    """
+    Scores job texts against the user profile, reusing cached results.
+    
+    Results are cached by content hash, so the same posting seen under
+    another URL (or re-scanned) does not pay for another LLM call. The
+    remaining texts are scored together in one batched request.
+    
+    Args:
+        job_texts: The job description texts.
+        user_profile: The profile to match against.
+    
+    Returns:
+        One result per text, in order, in `analyze_job_match` format.
+    """
+    keys = [analysis_cache_key(text, user_profile) for text in job_texts]
+    results: dict[str, dict] = {}
+    awaiting: dict[str, asyncio.Future] = {}
+    to_score: dict[str, str] = {}
+    
+    async with async_session() as session:
+        for key in dict.fromkeys(keys):
+            cached = await get_cached_analysis(session, key)
+            if cached is not None:
+                results[key] = cached
+
+    # No awaits from here until the owned futures are registered, so two
+    # workers never both decide to score the same posting
+    for key, text in zip(keys, job_texts):
+        if key in results or key in awaiting or key in to_score:
+            continue
+        if key in _inflight_analyses:
+            # Another worker is already scoring this posting; share its result
+            awaiting[key] = _inflight_analyses[key]
+        else:
+            to_score[key] = text
+    
+    if to_score:
+        loop = asyncio.get_running_loop()
+        owned = {key: loop.create_future() for key in to_score}
+        _inflight_analyses.update(owned)
+        try:
+            scored = await analyze_job_matches_batch(list(to_score.values()), user_profile)
+            for key, match_result in zip(to_score, scored):
+                results[key] = match_result
+                owned[key].set_result(match_result)
+            async with async_session() as session:
+                for key in to_score:
+                    if not results[key].get('error'):
+                        await store_cached_analysis(session, key, settings.OPENROUTER_MODEL, results[key])
+        finally:
+            for key, future in owned.items():
+                if not future.done():
+                    future.set_result({"match_score": None, "reasoning": "Error: analysis aborted",
+                                       "missing_skills": [], "error": True})
+                _inflight_analyses.pop(key, None)
+    
+    for key, future in awaiting.items():
+        results[key] = await asyncio.shield(future)
+    
+    return [results[key] for key in keys]
+
+
+def _match_values(match_result: dict) -> dict:
+    """
+    Maps an analysis result to JobListing column values.
+    
+    Failed analyses leave the score empty and mark the job "pending", so it
+    is re-scored later rather than recorded as a zero match, or "failed" if
+    the error is permanent.
+    """
+    values = {
+        "match_reasoning": match_result.get('reasoning', ''),
+        "missing_skills": match_result.get('missing_skills', []),
+    }
+    if match_result.get('error'):
+        status = "pending" if match_result.get('retryable', True) else "failed"
+        values.update(match_score=None, analysis_status=status)
+    else:
+        values.update(match_score=match_result.get('match_score', 0), analysis_status="done")
+    return values
+
+
+def _apply_match_result(job: JobListing, match_result: dict) -> None:
+    """Copies an analysis result onto a job (see `_match_values`)."""
+    for column, value in _match_values(match_result).items():
+        setattr(job, column, value)
+
+
+def _prefilter_job(fetched: dict, company: Company, matcher: ProfileMatcher):
+    """
+    Pipeline stage: cheap local relevance check before any LLM call.
+    
+    Args:
+        fetched: Output of `_fetch_job_page`.
+        company: The company the job belongs to.
+        matcher: Keyword matcher for the user profile.
+    
+    Returns:
+        The fetched dict if the job is plausible, otherwise a finished
+        JobListing carrying a low pre-filter score.
+    """
+    result = matcher.score(fetched['text'], fetched['description_text'])
+    if result.passed:
+        return fetched
+    
+    job = JobListing(
+        title=fetched['text'][:200],  # Truncate
+        url=fetched['href'],
+        company_id=company.id,
+        location=fetched.get('location'),
+        description_text=fetched['description_text'],
+    )
+    _apply_match_result(job, prefiltered_match_result(result))
+    job.analysis_status = "filtered"
+    return job
+
+
+async def _analyze_jobs(
+    batch: list,
+    company: Company,
+    user_profile: UserProfile
+) -> list[JobListing]:
+    """
+    Pipeline stage: scores a batch of fetched job pages against the user profile.
+    
+    Jobs already rejected by the pre-filter arrive as JobListings and are
+    passed through untouched.
+    
+    Args:
+        batch: Outputs of `_prefilter_job`.
+        company: The company the jobs belong to.
+        user_profile: The profile to match against.
+    
+    Returns:
+        One unsaved JobListing per item, in order.
+    """
+    to_analyze = [item for item in batch if not isinstance(item, JobListing)]
+    match_results = iter(await score_job_texts(
+        [fetched['description_text'] for fetched in to_analyze], user_profile
+    ))
+    
+    jobs = []
+    for fetched in batch:
+        if isinstance(fetched, JobListing):
+            jobs.append(fetched)
+            continue
+        match_result = next(match_results)
+        job = JobListing(
+            title=fetched['text'][:200],  # Truncate
+            url=fetched['href'],
+            company_id=company.id,
+            location=fetched.get('location'),
+            description_text=fetched['description_text'],
+        )
+        _apply_match_result(job, match_result)
+        jobs.append(job)
+    return jobs
 
 
-async def scrape_company(company: Company) -> None:
+async def rescore_pending_jobs(limit: int = 500) -> int:
+    """
+    Retries analysis for jobs whose LLM call previously failed.
+    
+    Pending jobs are loaded in one short session and results are written in
+    another per batch, so no connection is held during the LLM calls. Does
+    nothing while no OpenRouter client is configured, since every attempt
+    would fail and leave the jobs pending again.
+    
+    Each failed attempt doubles the wait before the next one, starting at
+    PENDING_RESCORE_INTERVAL_MINUTES; after PENDING_RESCORE_MAX_ATTEMPTS
+    the job is marked "failed". Jobs with the fewest attempts go first, so
+    postings that keep failing cannot crowd out newer ones.
+    
+    Args:
+        limit: Maximum number of pending jobs handled per run.
+    
+    Returns:
+        The number of jobs successfully re-scored.
+    """
+    if get_client() is None:
+        return 0
+    
+    now = datetime.now()
+    async with async_session() as session:
+        user_profile = (await session.exec(select(UserProfile))).first()
+        if not user_profile:
+            return 0
+        pending = (await session.exec(
+            select(JobListing.id, JobListing.title, JobDescription.content, JobListing.analysis_attempts)
+            .outerjoin(JobDescription, JobDescription.job_id == JobListing.id)
+            .where(
+                JobListing.analysis_status == "pending",
+                or_(JobListing.next_analysis_at == None, JobListing.next_analysis_at <= now)
+            )
+            .order_by(JobListing.analysis_attempts, JobListing.date_found)
+            .limit(limit)
+        )).all()
+    if not pending:
+        return 0
+    print(f"Re-scoring {len(pending)} pending job analyses")
+    
+    rescored = 0
+    batch_size = max(1, settings.ANALYSIS_BATCH_SIZE)
+    for start in range(0, len(pending), batch_size):
+        chunk = pending[start:start + batch_size]
+        match_results = await score_job_texts(
+            [decompress_text(content) or title for _, title, content, _ in chunk], user_profile
+        )
+        async with async_session() as session:
+            for (job_id, _, _, attempts), match_result in zip(chunk, match_results):
+                values = _match_values(match_result)
+                next_analysis_at = None
+                if values["analysis_status"] == "pending":
+                    attempts += 1
+                    if attempts >= settings.PENDING_RESCORE_MAX_ATTEMPTS:
+                        values["analysis_status"] = "failed"
+                    else:
+                        backoff = settings.PENDING_RESCORE_INTERVAL_MINUTES * 2 ** (attempts - 1)
+                        next_analysis_at = datetime.now() + timedelta(minutes=backoff)
+                    values["analysis_attempts"] = attempts
+                values["next_analysis_at"] = next_analysis_at
+                await session.exec(update(JobListing).where(JobListing.id == job_id).values(**values))
+                if values["analysis_status"] == "done":
+                    rescored += 1
+            await session.commit()
+    
+    print(f"Re-scored {rescored} of {len(pending)} pending jobs")
+    return rescored
+
+
+async def _update_company(company: Company, **values) -> None:
+    """
+    Persists scan bookkeeping on the company row and the given instance.
+    
+    An UPDATE statement is used because the instance may belong to another session.
+    """
+    for name, value in values.items():
+        setattr(company, name, value)
+    async with async_session() as session:
+        await session.exec(update(Company).where(Company.id == company.id).values(**values))
+        await session.commit()
+
+
+async def _conditional_career_page(company: Company) -> Optional[httpx.Response]:
+    """
+    Requests the career page with the validators of the last scan.
+    
+    Args:
+        company: The company about to be scanned.
+    
+    Returns:
+        The response (check it with `is_not_modified`; a changed page's 200
+        is reused by `_load_career_page`), or None if the company has no
+        usable validators or the request failed.
+    """
+    headers = conditional_headers(company)
+    if not headers:
+        return None
+    try:
+        return await http_fetcher.get(company.career_page_url, headers=headers)
+    except _HTTP_FETCH_ERRORS as e:
+        print(f"Conditional request for {company.name} failed: {e}")
+        return None
+
+
+async def _load_career_page(
+    company: Company,
+    browser: _LazyBrowserContext,
+    response: Optional[httpx.Response] = None
+) -> tuple[list[dict], dict, str]:
+    """
+    Loads the career page and extracts its candidate job links.
+    
+    Boards on a supported ATS are listed through its JSON API instead of
+    the page, with descriptions and locations included. Unless the company
+    is known to need a browser, a plain HTTP request is tried first. The
+    outcome is remembered in `Company.fetch_strategy`: "http" when the HTML
+    already contains job links, "browser" when it is a JavaScript shell.
+    HTML without job links and network errors fall back to the browser
+    without changing the strategy.
+    
+    Args:
+        company: The company to load.
+        browser: The company's lazily borrowed browser context.
+        response: A 200 response to the conditional request, parsed instead
+            of fetching the page again.
+    
+    Returns:
+        Tuple of (deduplicated candidate links with 'text' and canonical
+        'href', response headers, strategy used: "http", "browser" or the
+        ATS provider). Headers are only returned for the "http" strategy:
+        the validators of a JavaScript shell say nothing about its job list.
+    """
+    board = detect_ats(company.career_page_url) if settings.ATS_FAST_PATH_ENABLED else None
+    if board is not None:
+        postings = await fetch_ats_postings(board)
+        if postings is not None:
+            return postings, {}, board.provider
+    
+    if settings.HTTP_FETCH_ENABLED and company.fetch_strategy != "browser":
+        try:
+            if response is None or response.status_code != 200:
+                response = await http_fetcher.get(company.career_page_url)
+            response.raise_for_status()
+            page_url = str(response.url)
+            parsed = await asyncio.to_thread(parse_page, response.text, page_url)
+            is_rendered = bool(parsed.links) and not parsed.is_js_shell
+            candidates = select_candidate_links(parsed.links, page_url) if is_rendered else []
+            # JSON-LD postings are served even by JavaScript shells
+            candidates = await asyncio.to_thread(merge_json_ld_postings, response.text, page_url, candidates)
+            if candidates:
+                if company.fetch_strategy != "http":
+                    await _update_company(company, fetch_strategy="http")
+                return candidates, dict(response.headers), "http"
+            if is_rendered:
+                # Server-rendered chrome around a job list loaded by JavaScript, or
+                # no openings at all: let the browser decide, remembering nothing
+                print(f"No job links in the HTML of {company.name}'s career page; using the browser.")
+            else:
+                print(f"Career page for {company.name} is rendered by JavaScript; using the browser.")
+                await _update_company(company, fetch_strategy="browser")
+        except _HTTP_FETCH_ERRORS as e:
+            print(f"HTTP fetch of {company.name} failed ({e}); using the browser.")
+    
+    context = await browser.get()
+    page = await context.new_page()
+    try:
+        response = await page.goto(company.career_page_url, timeout=30000, wait_until="domcontentloaded")
+        await wait_until_ready(page, company.ready_selector)
+        
+        # TODO: Dynamic Navigation (analyze_navigation_step loop) would go here.
+        # For Phase 1, we assume the URL might be pre-filtered or we just scrape all.
+        
+        # Filtering, canonicalization and dedup run in the page, so only the
+        # candidate links cross the CDP boundary rather than every <a>
+        job_links = await page.evaluate(CANDIDATE_LINKS_SCRIPT, link_rules())
+    finally:
+        await page.close()
+    return job_links, {}, "browser"
+
+
+async def scrape_company(company: Company) -> int:
     """
     Scrapes a single company's career page for job listings.
     
     Args:
         company: The Company model instance to scrape.
+    
+    Returns:
+        The number of new jobs added.
+    
+    Raises:
+        Exception: Whatever stopped the scrape, after logging it; the daily
+            scan records it as the company's "error" status.
     """
     print(f"Starting scrape for {company.name} at {company.career_page_url}")
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)  # Set headless=False for debugging
-        context = await browser.new_context()
-        page = await context.new_page()
-        
+    async with _LazyBrowserContext(company) as browser:
         try:
-            await page.goto(company.career_page_url, timeout=30000)
-            await page.wait_for_load_state("networkidle")
-            
-            # TODO: Dynamic Navigation (analyze_navigation_step loop) would go here.
-            # For Phase 1, we assume the URL might be pre-filtered or we just scrape all.
+            response = await _conditional_career_page(company)
+            if response is not None and is_not_modified(company, response.status_code, response.headers):
+                print(f"Career page for {company.name} not modified since the last scan; skipping.")
+                await _update_company(company, last_scraped_at=datetime.now())
+                return 0
             
-            # Simple Generic Scraper Strategy: Look for <a> tags with 'career', 'job', or simple list items
-            # This is heuristic-based.
+            job_links, response_headers, strategy = await _load_career_page(company, browser, response)
+            print(f"Found {len(job_links)} candidate job links ({strategy} fetch).")
+            candidates = {link['href']: link for link in job_links}
             
-            # Extract links
-            job_links = await page.evaluate('''() => {
-                const links = Array.from(document.querySelectorAll('a'));
-                return links.map(link => ({
-                    text: link.innerText,
-                    href: link.href
-                })).filter(l => l.href.length > 10);
-            }''')
+            # Same job links as the last complete scan: nothing new to process
+            etag, last_modified = page_validators(response_headers)
+            fingerprint = link_fingerprint(candidates)
+            if settings.INCREMENTAL_SCAN_ENABLED and fingerprint == company.page_fingerprint:
+                print(f"Job links for {company.name} unchanged since the last scan; skipping.")
+                now = datetime.now()
+                await _update_company(
+                    company, last_scraped_at=now, page_verified_at=now,
+                    page_etag=etag, page_last_modified=last_modified
+                )
+                return 0
             
-            print(f"Found {len(job_links)} potential links.")
-            
-            session = Session(engine)
-            user_profile = session.exec(select(UserProfile)).first()
+            # Short-lived session: nothing stays open (idle in transaction)
+            # while pages are fetched and analyzed. Analysis workers and the
+            # writer open their own, since an AsyncSession cannot be shared.
+            async with async_session() as session:
+                user_profile = (await session.exec(select(UserProfile))).first()
+                # Deduplication against stored jobs in one set-based query
+                unseen = await filter_unseen_urls(session, candidates.keys())
             if not user_profile:
                 print("No user profile found. Skipping analysis.")
                 user_profile = UserProfile(resume_text="", preferences="")
+            print(f"{len(unseen)} of {len(candidates)} candidate links are new.")
 
-            new_jobs = []
-            
-            for link in job_links:
-                # Heuristic: Filter links that look like potential jobs
-                # This is weak, but good for a start. Real logic needs more specialized parsing.
-                if "job" in link['href'] or "career" in link['href'] or len(link['text']) > 10:
-                    
-                    # Deduplication
-                    existing = session.exec(
-                        select(JobListing).where(JobListing.url == link['href'])
-                    ).first()
-                    if existing:
-                        continue
-                        
+            async def discover_links():
+                """Stage 1: yield candidate links not yet stored."""
+                for href in unseen:
+                    link = candidates[href]
                     print(f"  New Job Found: {link['text']}")
-                    
-                    # Visit Job Page
-                    try:
-                        job_page = await context.new_page()
-                        await job_page.goto(link['href'])
-                        description_text = await job_page.evaluate("document.body.innerText")
-                        await job_page.close()
-                        
-                        # AI Analysis
-                        match_result = await analyze_job_match(description_text, user_profile)
-                        
-                        job = JobListing(
-                            title=link['text'][:200],  # Truncate
-                            url=link['href'],
-                            company_id=company.id,
-                            description_text=description_text,
-                            match_score=match_result.get('match_score', 0),
-                            match_reasoning=match_result.get('reasoning', ''),
-                            missing_skills=match_result.get('missing_skills', [])
-                        )
-                        session.add(job)
-                        new_jobs.append(job)
-                        
-                    except Exception as e:
-                        print(f"  Failed to process job link {link['href']}: {e}")
-
-            session.commit()
-            
-            # Update company last scraped
-            company.last_scraped_at = datetime.now()
-            session.add(company)
-            session.commit()
-            session.close()
+                    yield link
+
+            writer = JobListingWriter()
+            matcher = ProfileMatcher(user_profile)
+
+            async def prefilter(fetched: dict):
+                """Stage 3: reject clearly irrelevant pages without an LLM call."""
+                if not settings.PREFILTER_ENABLED:
+                    return fetched
+                return _prefilter_job(fetched, company, matcher)
+
+            async def write_job(job: JobListing) -> JobListing:
+                """Stage 5: buffer the job; the writer commits every WRITE_BATCH_SIZE rows."""
+                await writer.add(job)
+                return job
+
+            # Fetching, analysis and writes run as separate stages connected by
+            # bounded queues, so a slow LLM call no longer idles the browser.
+            cancelled = False
+            try:
+                stage_stats = await run_pipeline(
+                    discover_links(),
+                    [
+                        Stage("fetch", lambda link: _fetch_job_page(link, company, strategy, browser),
+                              concurrency=settings.DETAIL_FETCH_CONCURRENCY),
+                        Stage("prefilter", prefilter),
+                        Stage("analyze", lambda batch: _analyze_jobs(batch, company, user_profile),
+                              concurrency=settings.ANALYSIS_CONCURRENCY,
+                              batch_size=max(1, settings.ANALYSIS_BATCH_SIZE)),
+                        Stage("write", write_job),
+                    ],
+                    queue_size=settings.PIPELINE_QUEUE_SIZE
+                )
+            except asyncio.CancelledError:
+                # Timed out or shutting down: exit promptly. Unwritten jobs are
+                # still unseen, so the next scan picks them up again.
+                cancelled = True
+                raise
+            finally:
+                if not cancelled:
+                    # Keep the partial batch if a stage failed
+                    await writer.flush()
+            for stat in stage_stats:
+                print(f"  Stage {stat['stage']}: {stat['items_out']}/{stat['items_in']} items, "
+                      f"{stat['busy_seconds']}s busy, {stat['errors']} errors")
+            if browser.blocker is not None:
+                print(f"  Blocked {browser.blocker.blocked} of "
+                      f"{browser.blocker.blocked + browser.blocker.allowed} browser requests "
+                      f"(~{browser.blocker.estimated_bytes_saved / 1e6:.1f} MB saved, estimated)")
+
+            # Remember the page only if every link was processed; otherwise the
+            # next scan must not skip the links dropped this time
+            now = datetime.now()
+            if any(stat['errors'] for stat in stage_stats):
+                await _update_company(
+                    company, last_scraped_at=now, page_fingerprint=None,
+                    page_etag=None, page_last_modified=None
+                )
+            else:
+                await _update_company(
+                    company, last_scraped_at=now, page_fingerprint=fingerprint,
+                    page_etag=etag, page_last_modified=last_modified, page_verified_at=now
+                )
             
-            print(f"Scrape complete for {company.name}. Added {len(new_jobs)} new jobs.")
+            print(f"Scrape complete for {company.name}. Added {writer.inserted} new jobs.")
+            return writer.inserted
             
         except Exception as e:
             print(f"Error scraping {company.name}: {e}")
-        finally:
-            await browser.close()
+            raise
@@ -1,51 +1,148 @@
 """
 Database connection and session management.
 
-Provides SQLModel engine creation and session dependency for FastAPI.
+Provides the async SQLModel engine and session dependency used by the API
+and the scraper, plus a sync engine for startup migrations and scripts.
 Supports both SQLite (local development) and PostgreSQL (production).
 """
 
-from sqlmodel import SQLModel, create_engine, Session
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.config import settings
+from app.db.instrumentation import (
+    TimedAsyncAdaptedQueuePool, TimedQueuePool, pool_metrics, query_metrics
+)
+from app.db.migrations import run_migrations
 
 # Import models to ensure they're registered with SQLModel metadata
-from app.db.models import Company, JobListing, UserProfile  # noqa: F401
+from app.db.models import Company, JobListing, JobDescription, UserProfile, AnalysisCache  # noqa: F401
+
+# Async drivers used for each sync database URL scheme
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """
+    Maps a sync database URL to its async driver equivalent.
+
+    Args:
+        url: A DATABASE_URL such as postgresql://... or sqlite:///...
+
+    Returns:
+        The same URL using asyncpg or aiosqlite; URLs that already name
+        an async driver are returned unchanged.
+    """
+    scheme, sep, rest = url.partition("://")
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def default_pool_size() -> int:
+    """
+    Pool size used when DB_POOL_SIZE is 0.
+    
+    Each concurrently scanned company can hold one connection for its own
+    work (link dedup, a writer flush or a company update) plus one per
+    analysis worker, whose score_job_texts calls open cache sessions. The
+    scheduled re-scoring of pending jobs needs as many again as one
+    company, and the API gets 5.
+    """
+    per_company = 1 + max(1, settings.ANALYSIS_CONCURRENCY)
+    return max(1, settings.SCAN_CONCURRENCY) * per_company + per_company + 5
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Enables WAL so API reads do not block on scan writes (and vice versa)."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")  # Durable in WAL mode except on power loss
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
 
 # Configure engine based on database type
+is_sqlite = settings.DATABASE_URL.startswith("sqlite")
+in_memory = is_sqlite and (":memory:" in settings.DATABASE_URL or settings.DATABASE_URL.rstrip("/") == "sqlite:")
 connect_args = {}
-pool_settings = {}
+sync_pool_settings = {}
+async_pool_settings = {}
 
-if settings.DATABASE_URL.startswith("sqlite"):
+if is_sqlite:
     # SQLite requires check_same_thread for FastAPI
     connect_args = {"check_same_thread": False}
-else:
-    # PostgreSQL connection pooling settings
+if not in_memory:
+    # In-memory SQLite keeps SQLAlchemy's single-connection pool
     pool_settings = {
-        "pool_size": 5,
-        "max_overflow": 10,
-        "pool_pre_ping": True,  # Verify connections before use
+        "pool_size": settings.DB_POOL_SIZE or default_pool_size(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_pre_ping": not is_sqlite,  # Verify server connections before use
     }
+    # Timed pools report checkout waits to pool_metrics
+    sync_pool_settings = {"poolclass": TimedQueuePool, **pool_settings}
+    async_pool_settings = {"poolclass": TimedAsyncAdaptedQueuePool, **pool_settings}
 
+# Sync engine: schema creation, migrations and command-line utilities
 engine = create_engine(
     settings.DATABASE_URL,
-    echo=True,
+    echo=settings.DB_ECHO,
     connect_args=connect_args,
-    **pool_settings
+    pool_logging_name="sync",
+    **sync_pool_settings
+)
+
+# Async engine: everything running on the event loop (API, scraper, scheduler)
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    echo=settings.DB_ECHO,
+    pool_logging_name="async",
+    **async_pool_settings
 )
 
+if is_sqlite and settings.SQLITE_WAL and not in_memory:
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+
+pool_metrics.watch(engine)
+pool_metrics.watch(async_engine.sync_engine)
+
+if settings.DB_QUERY_METRICS_ENABLED:
+    query_metrics.install(engine)
+    query_metrics.install(async_engine.sync_engine)
+
 
 def create_db_and_tables() -> None:
-    """Create all database tables defined in SQLModel models."""
+    """Create all database tables defined in SQLModel models and apply migrations."""
     SQLModel.metadata.create_all(engine)
+    run_migrations(engine)
 
 
-def get_session():
+def async_session() -> AsyncSession:
     """
-    FastAPI dependency that yields a database session.
+    Creates an async session on the shared async engine.
+
+    Attributes stay loaded after commit, since lazy loads are not possible
+    outside the session's greenlet context.
+
+    Returns:
+        A new AsyncSession; use it as an async context manager.
+    """
+    return AsyncSession(async_engine, expire_on_commit=False)
+
+
+async def get_session():
+    """
+    FastAPI dependency that yields an async database session.
     
     Yields:
-        Session: A SQLModel session for database operations.
+        AsyncSession: A SQLModel async session for database operations.
     """
-    with Session(engine) as session:
+    async with async_session() as session:
         yield session
-
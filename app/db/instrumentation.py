@@ -0,0 +1,265 @@
+"""
+Database timing instrumentation.
+
+Opt-in SQL statement timing hooks SQLAlchemy cursor events to record a
+latency histogram per statement and keep a bounded log of slow queries.
+Statements are grouped by their SQL text with bound parameters left out,
+so the overhead is one perf_counter pair and a dict update per statement.
+
+Connection pool checkout waits are always recorded, through the pool
+classes below, to size the pool against scan and API concurrency.
+"""
+
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.config import settings
+
+# Histogram bucket upper bounds in milliseconds (the last bucket is open-ended)
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Longest statement text kept per histogram / slow log entry
+_MAX_STATEMENT_CHARS = 300
+
+# Collapses expanded IN (...) lists so each list length shares one entry
+_PLACEHOLDER_LIST_RE = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|\$\d+|:\w+)\s*,)+\s*(?:\?|%\(\w+\)s|\$\d+|:\w+)\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Reduces a SQL statement to a stable grouping key.
+
+    Args:
+        statement: SQL text as sent to the driver.
+
+    Returns:
+        The statement with whitespace collapsed, placeholder lists shortened
+        and long text truncated.
+    """
+    statement = _WHITESPACE_RE.sub(" ", statement).strip()
+    statement = _PLACEHOLDER_LIST_RE.sub("(...)", statement)
+    return statement[:_MAX_STATEMENT_CHARS]
+
+
+class _LatencyStats:
+    """Latency histogram for one statement or pool."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, duration_ms: float) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if duration_ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def as_dict(self) -> dict:
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 2),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "histogram": {label: n for label, n in zip(labels, self.buckets) if n},
+        }
+
+
+class QueryMetrics:
+    """
+    Per-statement latency histograms and a slow query log for an engine.
+
+    Thread-safe, since the sync engine may be used from worker threads.
+    """
+
+    def __init__(self, slow_query_ms: float, slow_log_size: int):
+        self.slow_query_ms = slow_query_ms
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._statements: dict[str, _LatencyStats] = {}
+        self._slow_queries: deque = deque(maxlen=max(1, slow_log_size))
+        self._errors = 0
+
+    def install(self, engine: Engine) -> None:
+        """
+        Starts timing every statement executed through `engine`.
+
+        Args:
+            engine: The (sync) engine to instrument.
+        """
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        event.listen(engine, "handle_error", self._on_error)
+        self.enabled = True
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info["query_started"].pop()
+        self.record(statement, (time.perf_counter() - started) * 1000)
+
+    def _on_error(self, exception_context) -> None:
+        started = exception_context.connection.info.get("query_started") if exception_context.connection else None
+        if started:
+            started.pop()
+        with self._lock:
+            self._errors += 1
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        """
+        Records one statement execution.
+
+        Args:
+            statement: SQL text as sent to the driver.
+            duration_ms: Execution time in milliseconds.
+        """
+        key = normalize_statement(statement)
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is None:
+                stats = self._statements[key] = _LatencyStats()
+            stats.record(duration_ms)
+            if duration_ms >= self.slow_query_ms:
+                self._slow_queries.append({
+                    "statement": key,
+                    "duration_ms": round(duration_ms, 2),
+                    "at": datetime.now().isoformat(),
+                })
+        if duration_ms >= self.slow_query_ms:
+            print(f"Slow query ({duration_ms:.0f} ms): {key}")
+
+    def snapshot(self, top: int = 50) -> dict:
+        """
+        Returns the collected metrics.
+
+        Args:
+            top: Number of statements to include, by total time spent.
+
+        Returns:
+            Totals, the `top` statements with their histograms, and the slow
+            query log (newest first).
+        """
+        with self._lock:
+            ranked = sorted(self._statements.items(), key=lambda item: item[1].total_ms, reverse=True)
+            return {
+                "enabled": self.enabled,
+                "slow_query_ms": self.slow_query_ms,
+                "statements_executed": sum(stats.count for stats in self._statements.values()),
+                "total_ms": round(sum(stats.total_ms for stats in self._statements.values()), 2),
+                "errors": self._errors,
+                "statements": [{"statement": statement, **stats.as_dict()} for statement, stats in ranked[:top]],
+                "slow_queries": list(reversed(self._slow_queries)),
+            }
+
+    def reset(self) -> None:
+        """Clears all collected metrics."""
+        with self._lock:
+            self._statements.clear()
+            self._slow_queries.clear()
+            self._errors = 0
+
+
+class PoolMetrics:
+    """Checkout wait histograms for the connection pools of watched engines."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waits: dict[str, _LatencyStats] = {}
+        self._timeouts: dict[str, int] = {}
+        self._engines: dict[str, Engine] = {}
+
+    def watch(self, engine: Engine) -> None:
+        """
+        Reports `engine`'s pool, labelled by its `pool_logging_name`.
+
+        Checkout waits are only recorded if the engine was created with one
+        of the timed pool classes.
+
+        Args:
+            engine: The (sync) engine whose pool is reported.
+        """
+        self._engines[engine.pool.logging_name or "default"] = engine
+
+    def record(self, name: str, wait_ms: float, timed_out: bool) -> None:
+        """Records one checkout from the pool labelled `name`."""
+        with self._lock:
+            stats = self._waits.get(name)
+            if stats is None:
+                stats = self._waits[name] = _LatencyStats()
+            stats.record(wait_ms)
+            if timed_out:
+                self._timeouts[name] = self._timeouts.get(name, 0) + 1
+
+    def snapshot(self) -> dict:
+        """
+        Returns current pool usage and checkout wait histograms.
+
+        Returns:
+            Per pool: configured size and overflow, connections checked out,
+            checkout wait statistics and the number of checkout timeouts.
+        """
+        pools = {}
+        with self._lock:
+            for name, engine in self._engines.items():
+                pool = engine.pool
+                usage = {"class": type(pool).__name__}
+                if isinstance(pool, QueuePool):
+                    usage.update({
+                        "pool_size": pool.size(),
+                        "max_overflow": pool._max_overflow,
+                        "timeout_seconds": pool.timeout(),
+                        "checked_out": pool.checkedout(),
+                        "checked_in": pool.checkedin(),
+                        "overflow": pool.overflow(),
+                    })
+                stats = self._waits.get(name)
+                usage["checkout_wait"] = stats.as_dict() if stats else None
+                usage["checkout_timeouts"] = self._timeouts.get(name, 0)
+                pools[name] = usage
+        return pools
+
+
+class _TimedCheckoutMixin:
+    """Times every connection checkout and reports it to `pool_metrics`."""
+
+    def connect(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            pool_metrics.record(
+                self.logging_name or "default", (time.perf_counter() - started) * 1000, timed_out
+            )
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    """QueuePool recording checkout waits."""
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool recording checkout waits."""
+
+
+pool_metrics = PoolMetrics()
+
+query_metrics = QueryMetrics(
+    slow_query_ms=settings.DB_SLOW_QUERY_MS,
+    slow_log_size=settings.DB_SLOW_QUERY_LOG_SIZE,
+)
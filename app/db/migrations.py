@@ -0,0 +1,158 @@
+"""
+Lightweight schema migrations.
+
+`SQLModel.metadata.create_all` only creates missing tables, so columns and
+indexes added to existing models would never reach an existing database.
+These steps run after create_all on every startup and are idempotent.
+"""
+
+from sqlalchemy import bindparam, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateColumn
+from sqlmodel import SQLModel
+from app.db.models import compress_text
+
+# Rows moved per transaction when relocating inline descriptions
+_DESCRIPTION_BATCH_SIZE = 1000
+
+
+def add_missing_columns(engine: Engine) -> list[str]:
+    """
+    Adds model columns that are missing from existing tables.
+    
+    Args:
+        engine: The database engine.
+    
+    Returns:
+        The added columns as "table.column".
+    """
+    inspector = inspect(engine)
+    added = []
+    with engine.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column_ddl}"))
+                added.append(f"{table.name}.{column.name}")
+    return added
+
+
+def create_missing_indexes(engine: Engine) -> list[str]:
+    """
+    Creates model indexes that are missing from existing tables.
+    
+    Args:
+        engine: The database engine.
+    
+    Returns:
+        The names of the created indexes.
+    """
+    inspector = inspect(engine)
+    created = []
+    with engine.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name in existing:
+                    continue
+                index.create(conn)
+                created.append(index.name)
+    return created
+
+
+def _mark_failed_analyses_pending(engine: Engine) -> None:
+    """Turn jobs stored with an LLM error as a zero score into pending analyses."""
+    with engine.begin() as conn:
+        conn.execute(text(
+            "UPDATE joblisting SET analysis_status = 'pending', match_score = NULL "
+            "WHERE match_reasoning LIKE 'Error:%' OR match_reasoning = 'API Key missing'"
+        ))
+
+
+def move_inline_descriptions(engine: Engine) -> int:
+    """
+    Moves a legacy joblisting.description_text column into JobDescription.
+    
+    Descriptions are copied compressed in batches, then the old column is
+    dropped (or, where the database cannot drop columns, left emptied).
+    
+    Args:
+        engine: The database engine.
+    
+    Returns:
+        The number of descriptions moved.
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table("joblisting"):
+        return 0
+    if "description_text" not in {column["name"] for column in inspector.get_columns("joblisting")}:
+        return 0
+    
+    moved = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(text(
+                "SELECT id, description_text FROM joblisting "
+                "WHERE description_text IS NOT NULL LIMIT :limit"
+            ), {"limit": _DESCRIPTION_BATCH_SIZE}).all()
+            if not rows:
+                break
+            ids = [row.id for row in rows]
+            conn.execute(
+                text("DELETE FROM jobdescription WHERE job_id IN :ids").bindparams(
+                    bindparam("ids", expanding=True)
+                ),
+                {"ids": ids}
+            )
+            conn.execute(
+                text("INSERT INTO jobdescription (job_id, content) VALUES (:job_id, :content)"),
+                [{"job_id": row.id, "content": compress_text(row.description_text)} for row in rows]
+            )
+            conn.execute(
+                text("UPDATE joblisting SET description_text = NULL WHERE id IN :ids").bindparams(
+                    bindparam("ids", expanding=True)
+                ),
+                {"ids": ids}
+            )
+        moved += len(rows)
+    
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE joblisting DROP COLUMN description_text"))
+    except Exception as e:
+        print(f"Migration: could not drop joblisting.description_text, leaving it empty: {e}")
+    return moved
+
+
+def run_migrations(engine: Engine) -> None:
+    """
+    Brings an existing database up to date with the models.
+    
+    Args:
+        engine: The database engine.
+    """
+    added = add_missing_columns(engine)
+    for column in added:
+        print(f"Migration: added column {column}")
+    
+    if "joblisting.analysis_status" in added:
+        _mark_failed_analyses_pending(engine)
+    
+    moved = move_inline_descriptions(engine)
+    if moved:
+        print(f"Migration: moved {moved} job descriptions to jobdescription")
+    
+    created = create_missing_indexes(engine)
+    for index in created:
+        print(f"Migration: created index {index}")
+    if created:
+        # Give the planner statistics for the new indexes (SQLite never auto-analyzes)
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
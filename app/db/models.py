@@ -1,11 +1,14 @@
 """
 SQLModel database models for the Job Auto-Applier system.
 
-Defines the core data models: Company, JobListing, and UserProfile.
+Defines the core data models: Company, JobListing, and UserProfile,
+plus the JobDescription side table and the AnalysisCache of LLM match results.
 """
 
-from typing import Optional, List
+import zlib
+from typing import Any, Optional, List
 from datetime import datetime
+from sqlalchemy import Column, Index, LargeBinary
 from sqlmodel import SQLModel, Field, Relationship, JSON
 
 
@@ -18,22 +21,67 @@ class Company(SQLModel, table=True):
     is_active: bool = True
     last_scraped_at: Optional[datetime] = None
     
+    # Change detection (see app.core.fingerprint)
+    page_fingerprint: Optional[str] = None  # sha256 of the candidate job link set
+    page_etag: Optional[str] = None
+    page_last_modified: Optional[str] = None
+    page_verified_at: Optional[datetime] = None  # Last complete scan of the rendered page
+    
+    # "auto" until the first scan decides; then "http" (plain request + HTML
+    # parse) or "browser" (the page needs JavaScript). Set it to force one.
+    fetch_strategy: str = Field(default="auto", sa_column_kwargs={"server_default": "auto"})
+    
+    # Request blocking overrides for the browser (see app.core.resource_blocking)
+    allowed_domains: Optional[List[str]] = Field(default=None, sa_type=JSON)  # Never blocked
+    blocked_domains: Optional[List[str]] = Field(default=None, sa_type=JSON)  # Always blocked
+    
+    # CSS selector present once the job list has rendered; without one the
+    # scraper waits for the DOM to stop changing (see app.core.readiness)
+    ready_selector: Optional[str] = None
+    
+    # CSS selector of a job page's description; without one it is found by
+    # JSON-LD or text density (see app.core.extraction)
+    description_selector: Optional[str] = None
+    
     # Job Listings relationship
     jobs: List["JobListing"] = Relationship(back_populates="company")
 
 
+class CompanyCreate(SQLModel):
+    """
+    Request body for creating a Company.
+    
+    The change detection fields (page_*) and scan timestamps are maintained
+    by the scraper and cannot be set through the API.
+    """
+    
+    name: str
+    career_page_url: str
+    is_active: bool = True
+    fetch_strategy: str = "auto"
+    allowed_domains: Optional[List[str]] = None
+    blocked_domains: Optional[List[str]] = None
+    ready_selector: Optional[str] = None
+    description_selector: Optional[str] = None
+
+
 class JobListing(SQLModel, table=True):
     """Represents a discovered job listing from a company's career page."""
     
+    # Composite indexes matching the /jobs access paths (newest first, with id
+    # as a tie-breaker) and the stats/score filters
+    __table_args__ = (
+        Index("ix_joblisting_date_found_id", "date_found", "id"),
+        Index("ix_joblisting_company_id_date_found_id", "company_id", "date_found", "id"),
+        Index("ix_joblisting_is_active_match_score", "is_active", "match_score"),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str
     url: str = Field(unique=True)
     company_id: Optional[int] = Field(default=None, foreign_key="company.id")
     location: Optional[str] = None
     
-    # Content
-    description_text: Optional[str] = None
-    
     # Metadata
     date_found: datetime = Field(default_factory=datetime.now)
     is_active: bool = True  # If the job is still on the site
@@ -42,8 +90,129 @@ class JobListing(SQLModel, table=True):
     match_score: Optional[int] = None  # 0-100
     match_reasoning: Optional[str] = None
     missing_skills: Optional[List[str]] = Field(default=None, sa_type=JSON)
+    # "done"; "pending" when the LLM call failed and the job awaits re-scoring;
+    # "failed" when the error was permanent or re-scoring gave up;
+    # "filtered" when the local pre-filter rejected it without an LLM call
+    analysis_status: str = Field(default="done", sa_column_kwargs={"server_default": "done"})
+    analysis_attempts: int = Field(default=0, sa_column_kwargs={"server_default": "0"})  # Failed re-scorings
+    next_analysis_at: Optional[datetime] = None  # Earliest next re-scoring of a pending job
     
     company: Optional[Company] = Relationship(back_populates="jobs")
+    
+    # Content lives in a side table so listing scans stay narrow. It is never
+    # lazy-loaded: queries that need `description_text` must eager-load it
+    # with selectinload(JobListing.description), anything else raises.
+    description: Optional["JobDescription"] = Relationship(
+        sa_relationship_kwargs={"uselist": False, "cascade": "all, delete-orphan", "lazy": "raise"}
+    )
+    
+    def __init__(self, **data):
+        description_text = data.pop("description_text", None)
+        super().__init__(**data)
+        if description_text is not None:
+            self.description_text = description_text
+    
+    @classmethod
+    def model_validate(cls, obj: Any, **kwargs) -> "JobListing":
+        """
+        Validates a JobListing, accepting `description_text` like `__init__`.
+        
+        SQLModel validates table models before instrumenting the instance,
+        so the text cannot be stored by a pydantic model validator.
+        """
+        description_text = None
+        if isinstance(obj, dict) and "description_text" in obj:
+            obj = dict(obj)
+            description_text = obj.pop("description_text")
+        job = super().model_validate(obj, **kwargs)
+        if description_text is not None:
+            job.description_text = description_text
+        return job
+    
+    @property
+    def description_text(self) -> Optional[str]:
+        """The job description text, decompressed from the side table."""
+        if self.description is None:
+            return None
+        return decompress_text(self.description.content)
+    
+    @description_text.setter
+    def description_text(self, text: Optional[str]) -> None:
+        if text is None:
+            self.description = None
+        elif self.description is None:
+            self.description = JobDescription(content=compress_text(text))
+        else:
+            self.description.content = compress_text(text)
+
+
+def compress_text(text: str) -> bytes:
+    """Compresses text for storage in a JobDescription."""
+    return zlib.compress(text.encode("utf-8"), 6)
+
+
+def decompress_text(content: Optional[bytes]) -> Optional[str]:
+    """Inverse of `compress_text`; None stays None."""
+    if content is None:
+        return None
+    return zlib.decompress(content).decode("utf-8")
+
+
+class JobDescription(SQLModel, table=True):
+    """Compressed description text of a job listing, one row per listing."""
+    
+    job_id: Optional[int] = Field(
+        default=None, primary_key=True, foreign_key="joblisting.id", ondelete="CASCADE"
+    )
+    content: bytes = Field(sa_column=Column(LargeBinary, nullable=False))  # zlib-compressed UTF-8
+
+
+class JobListingSummary(SQLModel):
+    """
+    List view of a job listing.
+    
+    The heavy fields are only present when explicitly requested through the
+    list endpoints' `fields` parameter; the full record is at GET /jobs/{id}.
+    """
+    
+    id: int
+    title: str
+    url: str
+    company_id: Optional[int] = None
+    location: Optional[str] = None
+    date_found: datetime
+    is_active: bool
+    match_score: Optional[int] = None
+    analysis_status: str
+    
+    # Optional fields (see JOB_SUMMARY_OPTIONAL_FIELDS)
+    match_reasoning: Optional[str] = None
+    missing_skills: Optional[List[str]] = None
+    description_text: Optional[str] = None
+
+
+class JobListingRead(JobListingSummary):
+    """Full view of a job listing returned by GET /jobs/{id}."""
+    
+    @classmethod
+    def from_job(cls, job: JobListing) -> "JobListingRead":
+        """Builds the read model, loading the description from its side table."""
+        return cls(**job.model_dump(), description_text=job.description_text)
+
+
+# Columns always selected for list views, and the extras selectable via `fields`
+JOB_SUMMARY_FIELDS = (
+    "id", "title", "url", "company_id", "location",
+    "date_found", "is_active", "match_score", "analysis_status",
+)
+JOB_SUMMARY_OPTIONAL_FIELDS = ("match_reasoning", "missing_skills", "description_text")
+
+
+class JobListingPage(SQLModel):
+    """A page of job listings with the cursor for the next page."""
+    
+    items: List[JobListingSummary]
+    next_cursor: Optional[str] = None  # None when this is the last page
 
 
 class UserProfile(SQLModel, table=True):
@@ -53,3 +222,17 @@ class UserProfile(SQLModel, table=True):
     name: str = "Default User"
     resume_text: str
     preferences: str  # "Remote, Python, Senior roles only"
+
+
+class AnalysisCache(SQLModel, table=True):
+    """Stored LLM match result, keyed by a hash of everything that shaped it."""
+    
+    # sha256 of (normalized job text, profile fingerprint, model, prompt version)
+    key: str = Field(primary_key=True, max_length=64)
+    model: str
+    
+    match_score: Optional[int] = None
+    match_reasoning: Optional[str] = None
+    missing_skills: Optional[List[str]] = Field(default=None, sa_type=JSON)
+    
+    created_at: datetime = Field(default_factory=datetime.now)
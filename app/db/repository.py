@@ -0,0 +1,175 @@
+"""
+Bulk persistence helpers for job listings and cached analyses.
+
+Keeps the scraper's database work to a handful of set-based statements per
+company instead of one round trip per discovered link.
+"""
+
+from datetime import datetime
+from typing import Iterable, Optional
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.config import settings
+from app.db.database import async_session
+from app.db.models import AnalysisCache, JobDescription, JobListing
+
+# Max URLs bound into a single IN (...) clause; keeps well under the
+# SQLite (999) and PostgreSQL (65535) bind parameter limits.
+DEDUP_CHUNK_SIZE = 500
+
+
+def _insert_ignoring_conflicts(session: AsyncSession, model: type, key: str):
+    """
+    Builds an INSERT that skips rows whose `key` already exists.
+    
+    Returns:
+        The statement, or None if the dialect has no ON CONFLICT support.
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model).on_conflict_do_nothing(index_elements=[key])
+    if dialect == "sqlite":
+        return sqlite.insert(model).on_conflict_do_nothing(index_elements=[key])
+    return None
+
+
+async def filter_unseen_urls(
+    session: AsyncSession,
+    urls: Iterable[str],
+    chunk_size: int = DEDUP_CHUNK_SIZE
+) -> list[str]:
+    """
+    Returns the URLs that are not yet stored as job listings.
+    
+    Args:
+        session: Database session.
+        urls: Candidate URLs; duplicates are collapsed, order is kept.
+        chunk_size: Number of URLs checked per query.
+    
+    Returns:
+        The unseen URLs, in their original order.
+    """
+    candidates = list(dict.fromkeys(urls))
+    seen: set[str] = set()
+    for start in range(0, len(candidates), chunk_size):
+        chunk = candidates[start:start + chunk_size]
+        seen.update((await session.exec(
+            select(JobListing.url).where(JobListing.url.in_(chunk))
+        )).all())
+    return [url for url in candidates if url not in seen]
+
+
+class JobListingWriter:
+    """
+    Buffers new job listings and writes them in committed batches.
+    
+    Each batch is one multi-row INSERT ... ON CONFLICT (url) DO NOTHING on
+    PostgreSQL and SQLite, so concurrent scans finding the same URL are
+    harmless and everything flushed before a crash stays committed.
+    Descriptions of the inserted rows follow in a second multi-row INSERT
+    into the JobDescription side table, in the same transaction.
+    
+    Each flush runs in its own short-lived session, so no connection is
+    held (idle in transaction) while the scrape fetches and analyzes pages.
+    """
+    
+    def __init__(self, batch_size: int = settings.WRITE_BATCH_SIZE):
+        self.batch_size = max(1, batch_size)
+        self.inserted = 0
+        self._pending: list[dict] = []
+        self._descriptions: dict[str, bytes] = {}  # url -> compressed description
+    
+    async def add(self, job: JobListing) -> None:
+        """Queue a job for insertion, flushing when the batch is full."""
+        self._pending.append(job.model_dump(exclude={"id"}))
+        if job.description is not None:
+            self._descriptions[job.url] = job.description.content
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+    
+    async def flush(self) -> int:
+        """
+        Insert and commit every queued job.
+        
+        Returns:
+            The number of rows actually inserted (conflicts are skipped).
+        """
+        if not self._pending:
+            return 0
+        rows, self._pending = self._pending, []
+        descriptions, self._descriptions = self._descriptions, {}
+        
+        async with async_session() as session:
+            stmt = _insert_ignoring_conflicts(session, JobListing, "url")
+            if stmt is None:
+                unseen = set(await filter_unseen_urls(session, (row["url"] for row in rows)))
+                rows = [row for row in rows if row["url"] in unseen]
+                if not rows:
+                    return 0
+                stmt = insert(JobListing)
+            
+            inserted_rows = (await session.exec(
+                stmt.values(rows).returning(JobListing.id, JobListing.url)
+            )).all()
+            description_rows = [
+                {"job_id": job_id, "content": descriptions[url]}
+                for job_id, url in inserted_rows if url in descriptions
+            ]
+            if description_rows:
+                await session.exec(insert(JobDescription).values(description_rows))
+            await session.commit()
+        inserted = len(inserted_rows)
+        self.inserted += inserted
+        return inserted
+
+
+async def get_cached_analysis(session: AsyncSession, key: str) -> Optional[dict]:
+    """
+    Looks up a stored analysis result.
+    
+    Args:
+        session: Database session.
+        key: Cache key from `analysis_cache_key`.
+    
+    Returns:
+        The result in `analyze_job_match` format, or None on a miss. Entries
+        without a score are treated as misses.
+    """
+    entry = await session.get(AnalysisCache, key)
+    if entry is None or entry.match_score is None:
+        return None
+    return {
+        "match_score": entry.match_score,
+        "reasoning": entry.match_reasoning,
+        "missing_skills": entry.missing_skills or [],
+    }
+
+
+async def store_cached_analysis(session: AsyncSession, key: str, model: str, result: dict) -> None:
+    """
+    Stores a successful analysis result; an existing entry for the key is kept.
+    
+    Args:
+        session: Database session.
+        key: Cache key from `analysis_cache_key`.
+        model: The model that produced the result.
+        result: The `analyze_job_match` result.
+    """
+    if result.get("error") or not isinstance(result.get("match_score"), int):
+        return
+    row = {
+        "key": key,
+        "model": model,
+        "match_score": result.get("match_score"),
+        "match_reasoning": result.get("reasoning"),
+        "missing_skills": result.get("missing_skills") or [],
+        "created_at": datetime.now(),
+    }
+    stmt = _insert_ignoring_conflicts(session, AnalysisCache, "key")
+    if stmt is not None:
+        await session.exec(stmt.values(**row))
+    elif await session.get(AnalysisCache, key) is None:
+        session.add(AnalysisCache(**row))
+    await session.commit()
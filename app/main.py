@@ -9,6 +9,8 @@ from contextlib import asynccontextmanager
 from app.db.database import create_db_and_tables
 from app.core.scheduler import start_scheduler, run_daily_scan
 from app.core.analyzer import get_client, test_api_connection
+from app.core.browser_pool import browser_pool
+from app.core.http_fetch import http_fetcher
 from app.api.routers import router as api_router
 from app.config import settings
 
@@ -18,13 +20,17 @@ async def lifespan(app: FastAPI):
     """
     Application lifespan context manager.
     
-    Initializes database and scheduler on startup, handles cleanup on shutdown.
+    Initializes database, browser pool and scheduler on startup,
+    handles cleanup on shutdown.
     """
     create_db_and_tables()
+    await browser_pool.start()
     start_scheduler()
     print("Database Initialized & Scheduler Started")
     yield
     print("Shutting down")
+    await browser_pool.stop()
+    await http_fetcher.stop()
 
 
 app = FastAPI(title="Job Auto Applier", lifespan=lifespan)
@@ -99,12 +105,12 @@ async def verify_system() -> dict:
     
     # Check 3: Database connection
     try:
-        from sqlmodel import Session, select
-        from app.db.database import engine
+        from sqlmodel import select
+        from app.db.database import async_session
         from app.db.models import Company
         
-        with Session(engine) as session:
-            session.exec(select(Company).limit(1)).first()
+        async with async_session() as session:
+            (await session.exec(select(Company).limit(1))).first()
             status["checks"]["database"] = True
     except Exception as e:
         status["overall"] = "unhealthy"
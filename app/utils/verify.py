@@ -9,6 +9,8 @@ from sqlmodel import Session, select
 from app.db.database import create_db_and_tables, engine
 from app.db.models import Company, UserProfile, JobListing
 from app.core.scraper import scrape_company
+from app.core.browser_pool import browser_pool
+from app.core.http_fetch import http_fetcher
 
 
 async def verify_system() -> None:
@@ -51,6 +53,8 @@ async def verify_system() -> None:
         company = session.get(Company, 1)
         # We run the scrape function directly
         await scrape_company(company)
+    await browser_pool.stop()
+    await http_fetcher.stop()
         
     print("\n--- 3. Check Results ---")
     with Session(engine) as session:
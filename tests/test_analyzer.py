@@ -0,0 +1,39 @@
+"""Tests for validation of LLM match results."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+import pytest
+from app.core import analyzer
+from app.db.models import UserProfile
+
+
+def _analyze(monkeypatch, reply) -> dict:
+    async def fake_completion(client, max_retries=None, **kwargs):
+        message = SimpleNamespace(content=json.dumps(reply))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(analyzer, "get_client", lambda: object())
+    monkeypatch.setattr(analyzer, "_create_completion", fake_completion)
+    return asyncio.run(analyzer.analyze_job_match("Python job", UserProfile(resume_text="Python", preferences="")))
+
+
+@pytest.mark.parametrize("score, expected", [(80, 80), (80.7, 80), ("80", 80), (130, 100), (-5, 0)])
+def test_valid_scores_are_normalized(monkeypatch, score, expected):
+    result = _analyze(monkeypatch, {"match_score": score, "reasoning": "ok", "missing_skills": ["Go"]})
+
+    assert result == {"match_score": expected, "reasoning": "ok", "missing_skills": ["Go"]}
+
+
+@pytest.mark.parametrize("reply", [
+    {"score": 80},
+    {"match_score": True},
+    {"match_score": "high"},
+    {"match_score": 80, "missing_skills": "Go"},
+    [{"match_score": 80}],
+])
+def test_malformed_replies_fail(monkeypatch, reply):
+    result = _analyze(monkeypatch, reply)
+
+    assert result["error"] is True
+    assert result["match_score"] is None
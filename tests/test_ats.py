@@ -0,0 +1,99 @@
+"""Tests for ATS board detection and JSON-LD posting merging."""
+
+import json
+import pytest
+from app.config import settings
+from app.core.ats import detect_ats, merge_json_ld_postings
+
+
+@pytest.mark.parametrize("url, provider, api_url, board_url", [
+    (
+        "https://boards.greenhouse.io/acme",
+        "greenhouse",
+        "https://boards-api.greenhouse.io/v1/boards/acme/jobs?content=true",
+        "https://boards.greenhouse.io/acme",
+    ),
+    (
+        "https://job-boards.greenhouse.io/acme/jobs/123",
+        "greenhouse",
+        "https://boards-api.greenhouse.io/v1/boards/acme/jobs?content=true",
+        "https://job-boards.greenhouse.io/acme/jobs/123",
+    ),
+    (
+        "https://boards.greenhouse.io/embed/job_board?for=acme",
+        "greenhouse",
+        "https://boards-api.greenhouse.io/v1/boards/acme/jobs?content=true",
+        "https://boards.greenhouse.io/embed/job_board?for=acme",
+    ),
+    (
+        "https://jobs.lever.co/acme",
+        "lever",
+        "https://api.lever.co/v0/postings/acme?mode=json",
+        "https://jobs.lever.co/acme",
+    ),
+    (
+        "https://jobs.eu.lever.co/acme/",
+        "lever",
+        "https://api.eu.lever.co/v0/postings/acme?mode=json",
+        "https://jobs.eu.lever.co/acme/",
+    ),
+    (
+        "https://acme.wd5.myworkdayjobs.com/en-US/External",
+        "workday",
+        "https://acme.wd5.myworkdayjobs.com/wday/cxs/acme/External",
+        "https://acme.wd5.myworkdayjobs.com/en-US/External",
+    ),
+    (
+        "https://acme.wd1.myworkdayjobs.com/Careers/job/Berlin/Engineer_R123",
+        "workday",
+        "https://acme.wd1.myworkdayjobs.com/wday/cxs/acme/Careers",
+        "https://acme.wd1.myworkdayjobs.com/Careers",
+    ),
+])
+def test_detect_ats(url, provider, api_url, board_url):
+    board = detect_ats(url)
+    assert board is not None
+    assert (board.provider, board.api_url, board.board_url) == (provider, api_url, board_url)
+
+
+@pytest.mark.parametrize("url", [
+    "https://example.com/careers",
+    "https://boards.greenhouse.io/embed/job_board",
+    "https://jobs.lever.co/",
+    "https://acme.wd5.myworkdayjobs.com/en-US",
+])
+def test_detect_ats_unrecognized(url):
+    assert detect_ats(url) is None
+
+
+def _listing_page(*postings: dict) -> str:
+    items = [{"@type": "ListItem", "item": {"@type": "JobPosting", **posting}} for posting in postings]
+    ld = {"@context": "https://schema.org", "@type": "ItemList", "itemListElement": items}
+    return f"<html><head><script type='application/ld+json'>{json.dumps(ld)}</script></head></html>"
+
+
+def test_merge_json_ld_postings_fills_and_adds_links():
+    description = "Build Python services. " * 20
+    page = _listing_page(
+        {"title": "Engineer", "url": "/jobs/1?utm_source=x", "description": description,
+         "jobLocation": {"address": {"addressLocality": "Paris", "addressCountry": "FR"}}},
+        {"title": "Designer", "url": "https://example.com/jobs/2", "description": description},
+    )
+    links = [{"text": "Engineer (Paris)", "href": "https://example.com/jobs/1"}]
+
+    merged = {link["href"]: link for link in merge_json_ld_postings(page, "https://example.com/careers", links)}
+
+    assert set(merged) == {"https://example.com/jobs/1", "https://example.com/jobs/2"}
+    assert merged["https://example.com/jobs/1"]["text"] == "Engineer"
+    assert merged["https://example.com/jobs/1"]["location"] == "Paris, FR"
+    assert merged["https://example.com/jobs/1"]["description_text"] == description.strip()
+    assert merged["https://example.com/jobs/2"]["description_text"] == description.strip()
+
+
+def test_merge_json_ld_postings_leaves_teasers_to_the_detail_page():
+    page = _listing_page({"title": "Engineer", "url": "/jobs/1", "description": "Short teaser."})
+
+    merged = merge_json_ld_postings(page, "https://example.com/careers", [])
+
+    assert len("Short teaser.") < settings.DESCRIPTION_MIN_CHARS
+    assert merged == [{"text": "Engineer", "href": "https://example.com/jobs/1", "location": None}]
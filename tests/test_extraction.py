@@ -0,0 +1,77 @@
+"""Tests for job description extraction and its method order."""
+
+import json
+import pytest
+from app.config import settings
+from app.core.extraction import extract_description, format_location
+
+POSTING = "We build Python services with FastAPI, Postgres and Kafka, on a remote-first team. " * 5
+BOILERPLATE = "<nav><a href='/'>Home</a> <a href='/jobs'>Jobs</a> <a href='/about'>About us</a></nav>"
+FOOTER = "<footer><p>Copyright Acme Inc. All rights reserved, everywhere, forever and always.</p></footer>"
+
+
+def _page(body: str, json_ld: dict = None) -> str:
+    head = f"<script type='application/ld+json'>{json.dumps(json_ld)}</script>" if json_ld else ""
+    return f"<html><head>{head}</head><body>{BOILERPLATE}{body}{FOOTER}</body></html>"
+
+
+def _job_posting(description: str) -> dict:
+    return {
+        "@context": "https://schema.org", "@type": "JobPosting", "title": "Engineer",
+        "description": f"<p>{description}</p>",
+        "jobLocation": {"@type": "Place", "address": {"addressLocality": "Berlin", "addressCountry": "DE"}},
+    }
+
+
+def test_json_ld_comes_first():
+    html_text = _page(f"<div class='job'><p>{POSTING}</p></div>", _job_posting("From JSON-LD. " + POSTING))
+
+    extracted = extract_description(html_text, selector=".job")
+
+    assert extracted.method == "json-ld"
+    assert extracted.text.startswith("From JSON-LD.")
+    assert extracted.location == "Berlin, DE"
+
+
+def test_short_json_ld_falls_through_to_the_selector():
+    html_text = _page(f"<div class='job'><p>{POSTING}</p></div>", _job_posting("Teaser."))
+
+    extracted = extract_description(html_text, selector=".job")
+
+    assert extracted.method == "selector"
+    assert extracted.text == POSTING.strip()
+
+
+def test_density_is_used_without_a_matching_selector():
+    html_text = _page(f"<main><div><p>{POSTING}</p><p>{POSTING}</p></div></main>")
+
+    extracted = extract_description(html_text, selector=".missing")
+
+    assert extracted.method == "density"
+    assert "Copyright" not in extracted.text and "About us" not in extracted.text
+    assert extracted.page_chars > len(extracted.text)
+
+
+def test_short_pages_fall_back_to_the_whole_page():
+    extracted = extract_description(_page("<p>Apply now.</p>"))
+
+    assert extracted.method == "page"
+    assert "Apply now." in extracted.text and "Copyright" in extracted.text
+
+
+def test_extraction_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "DESCRIPTION_EXTRACTION_ENABLED", False)
+
+    extracted = extract_description(_page(f"<p>{POSTING}</p>", _job_posting(POSTING)))
+
+    assert extracted.method == "page"
+
+
+@pytest.mark.parametrize("job_location, expected", [
+    ({"address": {"addressLocality": "Paris", "addressRegion": "IDF", "addressCountry": {"name": "FR"}}},
+     "Paris, IDF, FR"),
+    ([{"address": "Remote, EU"}, "Berlin", {"address": "Remote, EU"}], "Remote, EU; Berlin"),
+    (None, None),
+])
+def test_format_location(job_location, expected):
+    assert format_location(job_location) == expected
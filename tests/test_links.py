@@ -0,0 +1,58 @@
+"""Tests for job link canonicalization and scoring."""
+
+import pytest
+from app.core.links import canonicalize_url, job_link_score, select_candidate_links
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("HTTPS://Acme.COM:443/jobs/1", "https://acme.com/jobs/1"),
+    ("http://acme.com:8080", "http://acme.com:8080/"),
+    ("https://acme.com/jobs/1?utm_source=li&gclid=x&team=web", "https://acme.com/jobs/1?team=web"),
+    ("https://acme.com/jobs/1?utm%5Fsource=li", "https://acme.com/jobs/1"),
+    ("https://acme.com/jobs?id=1&ref=home&source=li", "https://acme.com/jobs?id=1&ref=home&source=li"),
+    ("https://acme.com/jobs/1#apply", "https://acme.com/jobs/1"),
+    ("https://acme.com/#/jobs/42", "https://acme.com/#/jobs/42"),
+    ("https://acme.com/#!/jobs/42", "https://acme.com/#!/jobs/42"),
+    ("https://acme.com/jobs/café lead?q=a b", "https://acme.com/jobs/caf%C3%A9%20lead?q=a%20b"),
+    ("https://acme.com/jobs/caf%c3%a9%20lead?q=a%20b", "https://acme.com/jobs/caf%C3%A9%20lead?q=a%20b"),
+    ("https://acme.com/jobs/%41-%2d-%2F", "https://acme.com/jobs/A---%2F"),
+])
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+@pytest.mark.parametrize("url", ["mailto:jobs@acme.com", "javascript:void(0)", "/jobs/1", "https://acme.com:99999/"])
+def test_canonicalize_url_rejects_non_http(url):
+    assert canonicalize_url(url) is None
+
+
+def test_job_link_score():
+    assert job_link_score("Senior Backend Engineer", "https://acme.com/careers/jobs/12345") == 6
+    assert job_link_score("Apply", "https://acme.com/jobs/12345") == 3
+    assert job_link_score("Registered Nurses, night shift", "https://acme.com/team/night-shift") == 3
+    assert job_link_score("Privacy Policy", "https://acme.com/careers/privacy") <= 0
+    assert job_link_score("Cookie settings", "https://acme.com/careers/cookie-policy") <= 0
+
+
+@pytest.mark.parametrize("text, url", [
+    ("Our blog: engineering culture", "https://acme.com/blog/culture"),
+    ("Meet the leadership team", "https://acme.com/about/leadership"),
+    ("Download our annual report", "https://acme.com/investors/annual-report"),
+])
+def test_long_text_alone_is_not_a_job_signal(text, url):
+    assert job_link_score(text, url) == 0
+
+
+def test_select_candidate_links_dedupes_and_filters():
+    links = [
+        {"text": "Apply", "href": "https://acme.com/jobs/12345?utm_source=li"},
+        {"text": "Senior  Backend\n Engineer", "href": "https://ACME.com/jobs/12345#apply"},
+        {"text": "Privacy Policy", "href": "https://acme.com/legal/privacy"},
+        {"text": "Careers", "href": "https://acme.com/careers?utm_campaign=x"},
+        {"text": "Our blog: engineering culture", "href": "https://acme.com/blog/culture"},
+        {"text": "Mail us", "href": "mailto:jobs@acme.com"},
+    ]
+
+    candidates = select_candidate_links(links, page_url="https://acme.com/careers")
+
+    assert candidates == [{"text": "Senior Backend Engineer", "href": "https://acme.com/jobs/12345", "score": 6}]
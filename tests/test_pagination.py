@@ -0,0 +1,30 @@
+"""Tests for keyset pagination cursors and field selection."""
+
+from datetime import datetime
+import pytest
+from fastapi import HTTPException
+from app.api.pagination import decode_cursor, encode_cursor, select_job_summaries
+
+
+@pytest.mark.parametrize("date_found, job_id", [
+    (datetime(2024, 5, 1, 12, 30, 15, 123456), 42),
+    (datetime(1999, 12, 31), 1),
+])
+def test_cursor_round_trip(date_found, job_id):
+    cursor = encode_cursor(date_found, job_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (date_found, job_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "e30", encode_cursor(datetime(2024, 1, 1), 1)[:-3] + "!!!"])
+def test_bad_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor)
+    assert exc_info.value.status_code == 400
+
+
+def test_select_job_summaries_rejects_unknown_fields():
+    with pytest.raises(HTTPException) as exc_info:
+        select_job_summaries("match_reasoning,password")
+    assert exc_info.value.status_code == 400
+    assert "password" in exc_info.value.detail
@@ -0,0 +1,62 @@
+"""Tests for the local keyword pre-filter."""
+
+import math
+import pytest
+from app.config import settings
+from app.core.prefilter import ProfileMatcher, prefiltered_match_result, tokenize
+from app.db.models import UserProfile
+
+
+@pytest.fixture
+def matcher() -> ProfileMatcher:
+    return ProfileMatcher(UserProfile(
+        resume_text="Python developer. Python, FastAPI and PostgreSQL on Kubernetes.",
+        preferences="Remote",
+    ))
+
+
+def test_tokenize_keeps_tech_tokens_and_drops_stopwords():
+    assert tokenize("We work with C++, C#, Node.js and K8s for 5 years.") == ["c++", "c#", "node.js", "k8s"]
+
+
+def test_profile_weights(matcher):
+    assert matcher.weights["python"] == pytest.approx(1 + math.log(2))
+    assert matcher.weights["fastapi"] == 1.0
+    assert matcher.total_weight == pytest.approx(sum(matcher.weights.values()))
+
+
+def test_matching_job_passes(matcher):
+    result = matcher.score("Backend Engineer (Remote)", "Python and FastAPI services on PostgreSQL.")
+
+    expected = sum(matcher.weights[term] for term in ("python", "fastapi", "postgresql", "remote"))
+    assert result.matched_terms == 4
+    assert result.score == pytest.approx(expected / matcher.total_weight)
+    assert result.passed
+
+
+def test_unrelated_job_is_rejected(matcher):
+    result = matcher.score("Registered Nurse", "Night shifts on the cardiology ward.")
+
+    assert result.matched_terms == 0
+    assert result.score == 0.0
+    assert not result.passed
+
+
+def test_too_few_terms_are_rejected(matcher, monkeypatch):
+    monkeypatch.setattr(settings, "PREFILTER_MIN_SCORE", 0.0)
+    monkeypatch.setattr(settings, "PREFILTER_MIN_MATCHED_TERMS", 2)
+
+    assert not matcher.score("Python Engineer", "").passed
+    assert matcher.score("Python Engineer", "FastAPI").passed
+
+
+def test_empty_profile_passes_everything():
+    result = ProfileMatcher(UserProfile(resume_text="", preferences="")).score("Anything", "at all")
+
+    assert result.passed and result.score == 1.0
+
+
+def test_prefiltered_match_result_caps_the_score(matcher):
+    result = matcher.score("Registered Nurse", "Python")
+
+    assert prefiltered_match_result(result)["match_score"] <= 10